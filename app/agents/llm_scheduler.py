@@ -0,0 +1,170 @@
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from app.config.logger_config import setup_logger
+logger = setup_logger()
+
+T = TypeVar("T")
+
+# HTTP codes meaning "slow down": the concurrency limit is cut on them
+_OVERLOAD_CODES = {429, 503}
+# HTTP codes worth another attempt
+_RETRYABLE_CODES = _OVERLOAD_CODES | {500, 502, 504}
+
+
+class TokenBucket:
+    """
+    Classic token bucket: `rate` tokens per second, at most `capacity` stored.
+    Waiters are served in FIFO order.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, amount: float = 1) -> None:
+        # a request bigger than the bucket would wait forever
+        amount = min(amount, self.capacity)
+
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+
+                await asyncio.sleep((amount - self._tokens) / self.rate)
+
+
+class AIMDLimiter:
+    """
+    Concurrency limit with additive increase / multiplicative decrease:
+    +1 slot per `limit` successful calls, `limit * decrease_factor` on overload.
+    Decreases are applied at most once per `cooldown_seconds`, so one burst of
+    429s counts as a single overload signal.
+    """
+
+    def __init__(self, min_limit: int, max_limit: int, decrease_factor: float = 0.5, cooldown_seconds: float = 1.0):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.decrease_factor = decrease_factor
+        self.cooldown_seconds = cooldown_seconds
+
+        self.limit = float(max_limit)
+        self.in_flight = 0
+        self._last_decrease = 0.0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self) -> None:
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def release(self) -> None:
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def on_success(self) -> None:
+        self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+    def on_overload(self) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown_seconds:
+            return
+
+        self._last_decrease = now
+        self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+        logger.warning("🐢 LLM overloaded, concurrency limit lowered to %s", int(self.limit))
+
+
+class LLMScheduler:
+    """
+    Shared gate in front of every LLM call:
+    - request and token rate limits (token buckets, per minute; 0 disables a limit),
+    - adaptive (AIMD) concurrency between `min_concurrency` and `max_concurrency`,
+    - retries of transient errors with exponential backoff and full jitter,
+      as long as the next attempt can start before `deadline_seconds`.
+    """
+
+    def __init__(self,
+                 requests_per_minute: float,
+                 tokens_per_minute: float,
+                 min_concurrency: int,
+                 max_concurrency: int,
+                 deadline_seconds: float,
+                 base_delay_seconds: float,
+                 max_delay_seconds: float):
+        self.request_bucket = TokenBucket(requests_per_minute / 60, requests_per_minute) if requests_per_minute > 0 else None
+        self.token_bucket = TokenBucket(tokens_per_minute / 60, tokens_per_minute) if tokens_per_minute > 0 else None
+        self.limiter = AIMDLimiter(min_limit=min_concurrency, max_limit=max_concurrency)
+        self.deadline_seconds = deadline_seconds
+        self.base_delay_seconds = base_delay_seconds
+        self.max_delay_seconds = max_delay_seconds
+
+    @property
+    def in_flight(self) -> int:
+        return self.limiter.in_flight
+
+    async def run(self, call: Callable[[], Awaitable[T]], estimated_tokens: int = 0) -> T:
+        deadline = time.monotonic() + self.deadline_seconds
+        attempt = 0
+
+        while True:
+            if self.request_bucket is not None:
+                await self.request_bucket.acquire(1)
+            if self.token_bucket is not None and estimated_tokens:
+                await self.token_bucket.acquire(estimated_tokens)
+
+            await self.limiter.acquire()
+            try:
+                result = await call()
+                self.limiter.on_success()
+                return result
+
+            except Exception as e:
+                code = _error_code(e)
+                if code not in _RETRYABLE_CODES:
+                    raise
+                if code in _OVERLOAD_CODES:
+                    self.limiter.on_overload()
+                error = e
+
+            finally:
+                await self.limiter.release()
+
+            attempt += 1
+            delay = random.uniform(0, min(self.max_delay_seconds, self.base_delay_seconds * 2 ** attempt))
+
+            if time.monotonic() + delay > deadline:
+                logger.warning("⌛ LLM call gave up after %s attempts: %s", attempt, error)
+                raise error
+
+            logger.info("🔁 LLM call failed with %s, retry %s in %.1fs", code, attempt, delay)
+            await asyncio.sleep(delay)
+
+
+def _error_code(error: Exception) -> Optional[int]:
+    """
+    HTTP status of an LLM API error (google.genai errors carry it as `code`),
+    falls back to the gRPC status names found in the error message.
+    """
+    code = getattr(error, "code", None) or getattr(error, "status_code", None)
+    if isinstance(code, int):
+        return code
+
+    message = str(error)
+    if "RESOURCE_EXHAUSTED" in message:
+        return 429
+    if "UNAVAILABLE" in message:
+        return 503
+
+    return None
@@ -1,13 +1,32 @@
 
 from google.adk import Agent              
-from .prompts import DETECTION_PROMPT
+from .prompts import DETECTION_PROMPT, SPAN_DETECTION_PROMPT, BATCH_DETECTION_PROMPT
 from app.utils.pii_spans_locator import locate_pii_spans
+from app.config.settings import LLM_MODEL
 
 
 pii_detector_agent = Agent(
     name="pii_detector_agent",
     description="Detects PII in a ticket body and returns spans to redact.",
-    model="gemini-1.5-flash",  
+    model=LLM_MODEL,
     instruction=DETECTION_PROMPT,
     tools=[locate_pii_spans]
 )
+
+# Same detection without the tool: the agent answers with plain spans in a single turn,
+# which are located in the text by the runner (see DETECTION_MODE)
+pii_span_detector_agent = Agent(
+    name="pii_span_detector_agent",
+    description="Detects PII in a ticket body and returns the PII spans found.",
+    model=LLM_MODEL,
+    instruction=SPAN_DETECTION_PROMPT,
+)
+
+# Detects PII in several delimited interactions at once and returns plain spans,
+# which are located in each interaction by the runner (see `detect_pii_batch`)
+pii_batch_detector_agent = Agent(
+    name="pii_batch_detector_agent",
+    description="Detects PII in several delimited interactions and returns spans per interaction.",
+    model=LLM_MODEL,
+    instruction=BATCH_DETECTION_PROMPT,
+)
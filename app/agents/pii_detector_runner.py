@@ -1,79 +1,313 @@
 import uuid
 import asyncio
+import threading
 
 import json
-from google.adk.sessions import InMemorySessionService
-from google.adk.runners import Runner, types
-from .pii_detector_agent import pii_detector_agent
-from app.models.pydentic_model import PIIEntity
+from typing import TYPE_CHECKING
+from .prompts import DETECTION_PROMPT, SPAN_DETECTION_PROMPT, BATCH_DETECTION_PROMPT
+from app.models.span import Span, parse_llm_entities, parse_llm_span_texts, parse_llm_batch_span_texts
 
 from app.utils.markdown_stripper import strip_markdown
+from app.utils.pii_spans_locator import find_pii_spans
+from app.utils.interaction_batcher import build_batch_message
+from app.utils.text_chunker import split_into_windows, stitch_window_entities
+from app.utils.detection_cache import DetectionCache, make_cache_key, make_detection_version
+from .llm_scheduler import LLMScheduler
+from app.utils.metrics import Counter, Gauge
+from app.config.settings import (MAX_CONCURRENT_DETECTIONS, DETECTION_CACHE_ENABLED, DETECTION_CACHE_MAX_ENTRIES,
+                                 DETECTION_CACHE_TTL_SECONDS, DETECTION_CACHE_PATH,
+                                 LLM_REQUESTS_PER_MINUTE, LLM_TOKENS_PER_MINUTE, LLM_MIN_CONCURRENCY,
+                                 LLM_RETRY_DEADLINE_SECONDS, LLM_RETRY_BASE_DELAY_SECONDS, LLM_RETRY_MAX_DELAY_SECONDS,
+                                 DETECTION_CHUNK_MAX_CHARS, DETECTION_CHUNK_OVERLAP_CHARS, DETECTION_MODE, LLM_MODEL)
+
+if TYPE_CHECKING:
+    from google.adk.runners import Runner
+
+from app.config.logger_config import setup_logger
+logger = setup_logger()
 
 
 APP_NAME  = "pii_redaction_app"
 USER_ID   = "fast_api_service"
 
-session_service = InMemorySessionService()
+# google.adk takes seconds to import: the session service and the runners are built
+# by `warm_up`, on startup (WARMUP_ON_STARTUP) or at the first detection
+session_service = None
+
+# Runner of the tool-calling single detection agent (DETECTION_MODE=tool)
+runner = None
+
+# Runner for the tool-less single detection agent (DETECTION_MODE=local)
+span_runner = None
+
+# Runner for the multi-interaction detection agent (see `detect_pii_batch`)
+batch_runner = None
 
+_warm_up_lock = threading.Lock()
+_warm = False
 
-runner = Runner(
-                agent=pii_detector_agent,
-                app_name=APP_NAME,
-                session_service=session_service,
-                
-                )
 
-# print(f"Runner created for agent '{runner.agent.name}'.")
+def _make_llm_scheduler(processes: int = 1) -> LLMScheduler:
+    """Scheduler with this process' share of the LLM quotas, when `processes` processes call the same backend."""
+    max_concurrency = max(1, MAX_CONCURRENT_DETECTIONS // processes)
+    return LLMScheduler(requests_per_minute=LLM_REQUESTS_PER_MINUTE / processes,
+                        tokens_per_minute=LLM_TOKENS_PER_MINUTE / processes,
+                        min_concurrency=min(LLM_MIN_CONCURRENCY, max_concurrency),
+                        max_concurrency=max_concurrency,
+                        deadline_seconds=LLM_RETRY_DEADLINE_SECONDS,
+                        base_delay_seconds=LLM_RETRY_BASE_DELAY_SECONDS,
+                        max_delay_seconds=LLM_RETRY_MAX_DELAY_SECONDS)
 
 
-async def detect_pii(ticket_body: str) -> list[PIIEntity]:
+# Process-wide gate for LLM calls, shared by all concurrent requests:
+# rate limits, adaptive concurrency (up to MAX_CONCURRENT_DETECTIONS) and retries
+llm_scheduler = _make_llm_scheduler()
+
+
+def share_llm_quotas(processes: int) -> None:
     """
-    Synchronously detect PII spans
+    Divides the LLM quotas (requests and tokens per minute, max concurrency) by `processes`,
+    for processes calling the same backend side by side (e.g. the workers of `app/cli/bulk_redact.py`).
+    Must be called before the first detection.
+    """
+    global llm_scheduler
+    llm_scheduler = _make_llm_scheduler(processes)
+
+# Results cache for identical interaction bodies, keyed on prompt + model version
+detection_cache = DetectionCache(max_entries=DETECTION_CACHE_MAX_ENTRIES,
+                                 ttl_seconds=DETECTION_CACHE_TTL_SECONDS,
+                                 path=DETECTION_CACHE_PATH) if DETECTION_CACHE_ENABLED else None
+
+if DETECTION_MODE not in ("local", "tool"):
+    raise ValueError(f"Unknown DETECTION_MODE: {DETECTION_MODE}")
+
+# the prompt differs per mode, so does the version
+DETECTION_VERSION = make_detection_version(SPAN_DETECTION_PROMPT if DETECTION_MODE == "local" else DETECTION_PROMPT, LLM_MODEL)
+BATCH_DETECTION_VERSION = make_detection_version(BATCH_DETECTION_PROMPT, LLM_MODEL)
+
+
+def warm_up() -> None:
+    """
+    Imports google.adk and builds the session service and the runners (those not set already,
+    e.g. replaced by the benchmarks). Blocking and idempotent, safe to call from several threads.
+    """
+    global session_service, runner, span_runner, batch_runner, _warm
+
+    with _warm_up_lock:
+        if _warm:
+            return
+
+        from google.adk.sessions import InMemorySessionService
+        from google.adk.runners import Runner
+        from .pii_detector_agent import pii_detector_agent, pii_span_detector_agent, pii_batch_detector_agent
 
+        if session_service is None:
+            session_service = InMemorySessionService()
+        if runner is None:
+            runner = Runner(agent=pii_detector_agent, app_name=APP_NAME, session_service=session_service)
+        if span_runner is None:
+            span_runner = Runner(agent=pii_span_detector_agent, app_name=APP_NAME, session_service=session_service)
+        if batch_runner is None:
+            batch_runner = Runner(agent=pii_batch_detector_agent, app_name=APP_NAME, session_service=session_service)
+
+        _warm = True
+        logger.info("🔥 Detection agents ready")
+
+
+def is_warm() -> bool:
+    return _warm
+
+
+async def detect_pii(ticket_body: str) -> list[Span]:
     """
+    Detect PII spans in a single interaction body.
+    Bodies longer than DETECTION_CHUNK_MAX_CHARS are split into overlapping windows
+    detected concurrently, their spans are shifted back to offsets in the whole body.
+    LLM calls go through `llm_scheduler` (rate limits, adaptive concurrency, retries).
+    Results for already seen bodies are served from `detection_cache`.
+    """
+    windows = split_into_windows(ticket_body, DETECTION_CHUNK_MAX_CHARS, DETECTION_CHUNK_OVERLAP_CHARS)
+
+    if len(windows) == 1:
+        return await _detect_pii_window(ticket_body)
+
+    logger.info("🧩 Detecting PII in %s windows of a %s characters body", len(windows), len(ticket_body))
+
+    entities_per_window = await asyncio.gather(*(_detect_pii_chunk(ticket_body[start:end]) for start, end in windows))
+
+    return stitch_window_entities([(start, entities) for (start, _), entities in zip(windows, entities_per_window)])
+
+
+async def _detect_pii_chunk(text: str) -> list[Span]:
+    """One more attempt for a failed window, so a single bad LLM answer doesn't fail the whole body."""
+    try:
+        return await _detect_pii_window(text)
+    except Exception as e:
+        logger.warning("⚠️ Window detection failed, retrying once: %s", e)
+        return await _detect_pii_window(text)
+
+
+async def _detect_pii_window(ticket_body: str) -> list[Span]:
+    cache_key = make_cache_key(ticket_body, DETECTION_VERSION)
+
+    if detection_cache is not None:
+        cached = await detection_cache.get(cache_key)
+        if cached is not None:
+            return [Span(**e) for e in cached]
+
+    await _ensure_warm()
+
+    if DETECTION_MODE == "local":
+        # single model turn: the agent returns {label, text} spans, located here
+        spans = await llm_scheduler.run(lambda: _run_agent(span_runner, ticket_body),
+                                        estimated_tokens=_estimate_tokens(SPAN_DETECTION_PROMPT, ticket_body))
+        entities = find_pii_spans(ticket_body, parse_llm_span_texts(spans))
+    else:
+        json_payload = await llm_scheduler.run(lambda: _run_agent(runner, ticket_body),
+                                               estimated_tokens=_estimate_tokens(DETECTION_PROMPT, ticket_body))
+        entities = parse_llm_entities(json_payload)
+    # print(f"📦 Entities: {entities}")
+
+    if detection_cache is not None:
+        await detection_cache.set(cache_key, [e._asdict() for e in entities])
+
+    return entities
+
+
+async def detect_pii_batch(ticket_bodies: list[str]) -> list[list[Span]]:
+    """
+    Detect PII spans in several interaction bodies with a single LLM call.
+
+    The bodies are packed into one delimited message, the agent returns
+    `{"interaction": int, "label": str, "text": str}` spans, which are then
+    located locally in their own interaction body — so `start`/`end` of the
+    returned entities are offsets within that interaction.
+    Results are returned in the same order as `ticket_bodies`.
+    Only bodies missing from `detection_cache` are sent to the LLM.
+    """
+    results: list[list[Span] | None] = [None] * len(ticket_bodies)
+    cache_keys = [make_cache_key(body, BATCH_DETECTION_VERSION) for body in ticket_bodies]
+
+    if detection_cache is not None:
+        for i, cache_key in enumerate(cache_keys):
+            cached = await detection_cache.get(cache_key)
+            if cached is not None:
+                results[i] = [Span(**e) for e in cached]
+
+    missing = [i for i, result in enumerate(results) if result is None]
+    if not missing:
+        return results
+
+    message = build_batch_message([ticket_bodies[i] for i in missing])
+
+    await _ensure_warm()
+
+    json_payload = await llm_scheduler.run(lambda: _run_agent(batch_runner, message),
+                                           estimated_tokens=_estimate_tokens(BATCH_DETECTION_PROMPT, message))
+
+    spans_per_interaction: list[list[dict]] = [[] for _ in missing]
+
+    for span in parse_llm_batch_span_texts(json_payload):
+        index = span["interaction"]
+        # ignore spans pointing to an interaction which was not in the batch
+        if 0 <= index < len(missing):
+            spans_per_interaction[index].append({"label": span["label"], "text": span["text"]})
+
+    for i, spans in zip(missing, spans_per_interaction):
+        results[i] = find_pii_spans(ticket_bodies[i], spans)
+        if detection_cache is not None:
+            await detection_cache.set(cache_keys[i], [e._asdict() for e in results[i]])
+
+    return results
+
+
+async def _ensure_warm() -> None:
+    if not _warm:
+        # off the event loop: importing google.adk takes seconds
+        await asyncio.to_thread(warm_up)
+
+
+async def _run_agent(agent_runner: "Runner", text: str):
+    """
+    Runs the agent in a fresh session and returns the final response parsed as JSON.
+    The session is deleted afterwards, whatever the outcome, so sessions never pile up in memory.
+    """
+    from google.genai import types
 
     session_id = str(uuid.uuid4())
-   
+
     # 1. Create the specific session where the conversation will happen
     await session_service.create_session(
                         app_name=APP_NAME,
                         user_id=USER_ID,
                         session_id=session_id
                         )
-    # print(f"✅ Session created: {session_id}")   
-  
+    # print(f"✅ Session created: {session_id}")
+
     # 2. ADK Agent needs the payload wrapped in a Content object:
-    message = types.Content(role="user", parts=[types.Part(text=ticket_body)])
+    message = types.Content(role="user", parts=[types.Part(text=text)])
     # print(f"📩 Message: {message}")
 
     # 3. Main Agent Runner loop
-    async for event in runner.run_async(
+    events = agent_runner.run_async(
         user_id=USER_ID,
         session_id=session_id,
         new_message=message
-    ):
-        # print("🔄 Received event")
+    )
+
+    try:
+        async for event in events:
+            # print("🔄 Received event")
 
-        if event.is_final_response():
-            # print("✅ Final response found")
+            if event.is_final_response():
+                # print("✅ Final response found")
 
-            if event.content and event.content.parts:
-                raw_payload = event.content.parts[0].text
-                # print(f"📦 Payload: {raw_payload}")
+                if event.content and event.content.parts:
+                    raw_payload = event.content.parts[0].text
+                    # print(f"📦 Payload: {raw_payload}")
 
-                clean_payload = strip_markdown(raw_payload)               
-                # print(f"📦 Payload: {clean_payload}")
+                    clean_payload = strip_markdown(raw_payload)
+                    # print(f"📦 Payload: {clean_payload}")
 
-                json_payload = json.loads(clean_payload)
-                # print(f"📦 JSON Payload: {json_payload}")
+                    json_payload = json.loads(clean_payload)
+                    # print(f"📦 JSON Payload: {json_payload}")
 
-                entities = [PIIEntity(**e) for e in json_payload]
-                # print(f"📦 Entities: {entities}")
+                    return json_payload
 
-                return entities
+    finally:
+        # 4. Stop the runner and drop the session with all its events
+        await events.aclose()
+        await session_service.delete_session(
+                        app_name=APP_NAME,
+                        user_id=USER_ID,
+                        session_id=session_id
+                        )
 
     raise RuntimeError("❌ Received no final response with JSON")
 
-    
-    
 
+def _estimate_tokens(instruction: str, text: str) -> int:
+    """Rough token count of a call (~4 characters per token), input is counted twice to cover the output."""
+    return (len(instruction) + 2 * len(text)) // 4
+
+
+def active_sessions() -> int:
+    """Number of ADK sessions currently held in memory."""
+    if session_service is None:
+        return 0
+    return len(session_service.sessions.get(APP_NAME, {}).get(USER_ID, {}))
+
+
+# ---------------------------------------------------------
+# Metrics (read at scrape time)
+# ---------------------------------------------------------
+Gauge("pii_llm_calls_in_flight", "LLM calls currently running.",
+      function=lambda: llm_scheduler.in_flight)
+Gauge("pii_llm_concurrency_limit", "Current adaptive (AIMD) limit of concurrent LLM calls.",
+      function=lambda: int(llm_scheduler.limiter.limit))
+Gauge("pii_adk_sessions", "ADK sessions currently held in memory.",
+      function=active_sessions)
+Counter("pii_detection_cache_hits_total", "Detection cache hits.",
+        function=lambda: detection_cache.hits if detection_cache is not None else 0)
+Counter("pii_detection_cache_misses_total", "Detection cache misses.",
+        function=lambda: detection_cache.misses if detection_cache is not None else 0)
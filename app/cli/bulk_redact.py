@@ -0,0 +1,257 @@
+# Offline bulk redaction of JSONL dumps
+# -----------------------------------------------------------------------------
+#   python -m app.cli.bulk_redact tickets.jsonl redacted.jsonl --processes 4
+#
+# Input: one ticket per line, in the CRM shape of `mock_db.json`
+#   {"id": str, "interactions": [{"id": str, "interaction_body": str}]}
+# or in the `Ticket` schema shape. Output: one `RedactedTicket` per line,
+# in the input order.
+#
+# Batches of lines are redacted by a pool of worker processes, each running
+# several tickets concurrently on its own event loop. After every batch written
+# to the output, a checkpoint (`<output>.checkpoint`) records how far the input
+# and the output got, so an interrupted run resumes from there. Lines of failed
+# tickets (including tickets with an interaction whose detection failed) go to
+# `<output>.failed`, a JSONL file which can be redacted again.
+#
+# The workers share the LLM quotas (LLM_REQUESTS_PER_MINUTE, LLM_TOKENS_PER_MINUTE,
+# MAX_CONCURRENT_DETECTIONS): each process gets 1/`--processes` of them.
+# -----------------------------------------------------------------------------
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import BinaryIO, Deque, Dict, Iterator, List, Optional, Tuple
+
+from app.models.pydentic_model import Ticket, Interaction
+from app.utils.pii_redactor import get_strategy
+
+from app.config.logger_config import setup_logger
+logger = setup_logger()
+
+# Event loop of a worker process, reused across batches: the LLM scheduler
+# and other module-level asyncio primitives are bound to the first loop using them
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def run_bulk_redaction(input_path: str,
+                       output_path: str,
+                       redaction_strategy: str,
+                       processes: int,
+                       concurrency: int,
+                       batch_size: int,
+                       restart: bool = False) -> Dict[str, int]:
+    """
+    Redacts every ticket of `input_path` into `output_path`, resuming from the
+    checkpoint of a previous run unless `restart` is set.
+    Tickets which fail are logged, left out of the output and appended to `<output>.failed`.
+    Returns the counts of written and failed tickets (including previous runs).
+    """
+    # fail fast, instead of every interaction being skipped by the workers
+    get_strategy(redaction_strategy)
+
+    checkpoint_path = output_path + ".checkpoint"
+    failed_path = output_path + ".failed"
+    checkpoint = None if restart or not os.path.exists(output_path) else _load_checkpoint(checkpoint_path)
+
+    if checkpoint is None:
+        checkpoint = {"input_offset": 0, "output_offset": 0, "failed_offset": 0, "written": 0, "failed": 0}
+        # reset the checkpoint before the output, a stale one must never point past it
+        _save_checkpoint(checkpoint_path, checkpoint)
+        open(output_path, "wb").close()
+        open(failed_path, "wb").close()
+    else:
+        logger.info("⏯️ Resuming after %s tickets (input byte %s)", checkpoint["written"] + checkpoint["failed"],
+                    checkpoint["input_offset"])
+
+    # "spawn": workers import the app from scratch instead of inheriting
+    # the parent's logger thread and event loop state
+    pool = ProcessPoolExecutor(max_workers=processes,
+                               mp_context=multiprocessing.get_context("spawn"),
+                               initializer=_init_worker,
+                               initargs=(processes,))
+
+    # checkpoints written before failed lines were kept have no `failed_offset`
+    checkpoint.setdefault("failed_offset", 0)
+    if not os.path.exists(failed_path):
+        open(failed_path, "wb").close()
+
+    with open(input_path, "rb") as source, open(output_path, "r+b") as sink, open(failed_path, "r+b") as failed_sink, pool:
+        source.seek(checkpoint["input_offset"])
+        # drop whatever was written after the last checkpoint
+        sink.truncate(checkpoint["output_offset"])
+        sink.seek(checkpoint["output_offset"])
+        failed_sink.truncate(checkpoint["failed_offset"])
+        failed_sink.seek(checkpoint["failed_offset"])
+
+        # batches in submission order, at most two per process in flight
+        pending: Deque[Tuple[Future, int]] = deque()
+
+        for lines, input_offset in _read_batches(source, checkpoint["input_offset"], batch_size):
+            pending.append((pool.submit(_redact_lines, lines, redaction_strategy, concurrency), input_offset))
+
+            while len(pending) >= 2 * processes:
+                _write_batch(sink, failed_sink, pending.popleft(), checkpoint, checkpoint_path)
+
+        while pending:
+            _write_batch(sink, failed_sink, pending.popleft(), checkpoint, checkpoint_path)
+
+    logger.info("⏹️ Bulk redaction done: %s tickets written, %s failed", checkpoint["written"], checkpoint["failed"])
+
+    return {"written": checkpoint["written"], "failed": checkpoint["failed"]}
+
+
+def _read_batches(source: BinaryIO, offset: int, batch_size: int) -> Iterator[Tuple[List[bytes], int]]:
+    """Yields batches of non-empty lines with the input offset right after the batch."""
+    lines: List[bytes] = []
+
+    for line in source:
+        offset += len(line)
+        if line.strip():
+            lines.append(line)
+
+        if len(lines) >= batch_size:
+            yield lines, offset
+            lines = []
+
+    if lines:
+        yield lines, offset
+
+
+def _write_batch(sink: BinaryIO,
+                 failed_sink: BinaryIO,
+                 batch: Tuple[Future, int],
+                 checkpoint: Dict[str, int],
+                 checkpoint_path: str) -> None:
+    future, input_offset = batch
+    redacted_lines, failed_lines = future.result()
+
+    if redacted_lines:
+        sink.write("".join(line + "\n" for line in redacted_lines).encode("utf-8"))
+    sink.flush()
+    os.fsync(sink.fileno())
+
+    if failed_lines:
+        failed_sink.write(b"".join(line if line.endswith(b"\n") else line + b"\n" for line in failed_lines))
+        failed_sink.flush()
+        os.fsync(failed_sink.fileno())
+
+    checkpoint.update(input_offset=input_offset,
+                      output_offset=sink.tell(),
+                      failed_offset=failed_sink.tell(),
+                      written=checkpoint["written"] + len(redacted_lines),
+                      failed=checkpoint["failed"] + len(failed_lines))
+    _save_checkpoint(checkpoint_path, checkpoint)
+
+    logger.info("💾 Checkpoint: %s tickets written, %s failed", checkpoint["written"], checkpoint["failed"])
+
+
+def _load_checkpoint(path: str) -> Optional[Dict[str, int]]:
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save_checkpoint(path: str, checkpoint: Dict[str, int]) -> None:
+    # write + rename, so a crash never leaves a half-written checkpoint
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, path)
+
+
+# ---------------------------------------------------------
+# Worker process side
+# ---------------------------------------------------------
+
+def _init_worker(processes: int) -> None:
+    global _worker_loop
+    _worker_loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(_worker_loop)
+
+    # all workers call the same LLM backend: each one gets its share of the quotas
+    from app.agents.pii_detector_runner import share_llm_quotas
+    share_llm_quotas(processes)
+
+
+def _redact_lines(lines: List[bytes], redaction_strategy: str, concurrency: int) -> Tuple[List[str], List[bytes]]:
+    """Redacts a batch of input lines; returns the output lines and the input lines of failed tickets (input order)."""
+    results = _worker_loop.run_until_complete(_redact_lines_async(lines, redaction_strategy, concurrency))
+    redacted_lines = [result for result in results if result is not None]
+    failed_lines = [line for line, result in zip(lines, results) if result is None]
+    return redacted_lines, failed_lines
+
+
+async def _redact_lines_async(lines: List[bytes], redaction_strategy: str, concurrency: int) -> List[Optional[str]]:
+    # imported in the workers only, the parent process doesn't need the agents
+    from app.services.redaction_service import redact_ticket_content
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def redact_line(line: bytes) -> Optional[str]:
+        async with semaphore:
+            try:
+                ticket = _parse_ticket(json.loads(line))
+                redacted_ticket = await redact_ticket_content(ticket, redaction_strategy, source="bulk_cli")
+            except Exception as e:
+                logger.warning("⚠️ Skipping ticket %s — %s", _ticket_id(line), e)
+                return None
+
+            # interactions whose detection failed are left out: the ticket must be redacted again
+            skipped = len(ticket.interactions) - len(redacted_ticket.interactions)
+            if skipped:
+                logger.warning("⚠️ Skipping ticket %s — %s of %s interactions not redacted",
+                               ticket.ticket_id, skipped, len(ticket.interactions))
+                return None
+
+            return redacted_ticket.model_dump_json()
+
+    return await asyncio.gather(*(redact_line(line) for line in lines))
+
+
+def _parse_ticket(raw_ticket: dict) -> Ticket:
+    if "ticket_id" in raw_ticket:
+        return Ticket.model_validate(raw_ticket)
+
+    # CRM shape: interaction "id" → "interaction_id"
+    return Ticket(ticket_id=raw_ticket["id"],
+                  interactions=[Interaction(interaction_id=interaction["id"],
+                                            interaction_body=interaction["interaction_body"])
+                                for interaction in raw_ticket["interactions"]])
+
+
+def _ticket_id(line: bytes) -> str:
+    try:
+        raw_ticket = json.loads(line)
+        return str(raw_ticket.get("ticket_id", raw_ticket.get("id")))
+    except Exception:
+        return "<unparsable line>"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Redact PII in a JSONL dump of tickets")
+    parser.add_argument("input", help="JSONL file, one ticket per line")
+    parser.add_argument("output", help="JSONL file receiving the redacted tickets")
+    parser.add_argument("--strategy", default=os.getenv("REDACTION_STRATEGY", "mask"), help="redaction strategy")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--concurrency", type=int, default=8, help="tickets redacted at the same time per process")
+    parser.add_argument("--batch-size", type=int, default=100, help="lines per batch (and per checkpoint)")
+    parser.add_argument("--restart", action="store_true", help="ignore the checkpoint of a previous run")
+    args = parser.parse_args()
+
+    counts = run_bulk_redaction(input_path=args.input,
+                                output_path=args.output,
+                                redaction_strategy=args.strategy,
+                                processes=args.processes,
+                                concurrency=args.concurrency,
+                                batch_size=args.batch_size,
+                                restart=args.restart)
+    print(json.dumps(counts))
+
+
+if __name__ == "__main__":
+    main()
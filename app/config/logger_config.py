@@ -1,21 +1,36 @@
+import atexit
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+from app.config.settings import LOG_LEVEL
 
 APP_LOGGER_NAME = "pii_redaction_app"
 
 def setup_logger() -> logging.Logger:
     logger = logging.getLogger(APP_LOGGER_NAME)
-    logger.setLevel(logging.DEBUG)
 
     # Prevent adding handlers multiple times in case of re-import
     if not logger.hasHandlers():
+        logger.setLevel(LOG_LEVEL)
+
+        # Records are put on a queue and written by a background thread,
+        # so a slow log sink never blocks the event loop
         handler = logging.StreamHandler()
         formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
         handler.setFormatter(formatter)
-        logger.addHandler(handler)
+
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        listener = QueueListener(log_queue, handler, respect_handler_level=True)
+        listener.start()
+        # flush pending records on exit
+        atexit.register(listener.stop)
+
+        logger.addHandler(QueueHandler(log_queue))
 
         # Prevent logs from propagating to the root logger
         logger.propagate = False
-        
+
     silence_third_party_loggers()
 
     return logger
@@ -25,4 +40,4 @@ def silence_third_party_loggers():
     logging.getLogger("uvicorn").setLevel(logging.WARNING)
     logging.getLogger("asyncio").setLevel(logging.WARNING)
     logging.getLogger("httpcore").setLevel(logging.ERROR)
-    logging.getLogger("httpx").setLevel(logging.ERROR)
\ No newline at end of file
+    logging.getLogger("httpx").setLevel(logging.ERROR)
@@ -0,0 +1,205 @@
+import os
+
+from dotenv import load_dotenv
+
+# Settings are read at import time by service modules, which are imported
+# before `app.main` gets a chance to load the `.env` file.
+load_dotenv()
+
+# -------------------------
+# Concurrency
+# -------------------------
+
+# Max number of interactions of a single ticket processed at the same time
+MAX_CONCURRENT_INTERACTIONS = int(os.getenv("MAX_CONCURRENT_INTERACTIONS", "8"))
+
+# Max number of LLM detections running at the same time across the whole process
+# (upper bound of the adaptive limit, see "LLM rate limits" below)
+MAX_CONCURRENT_DETECTIONS = int(os.getenv("MAX_CONCURRENT_DETECTIONS", "16"))
+
+# -------------------------
+# Detection agents
+# -------------------------
+
+# Model of the detection agents
+LLM_MODEL = os.getenv("LLM_MODEL", "gemini-1.5-flash")
+
+# "local": the agent returns {label, text} spans in one turn, which are located in the text locally;
+# "tool": the agent calls the `locate_pii_spans` tool and echoes its result (one more model turn)
+DETECTION_MODE = os.getenv("DETECTION_MODE", "local").lower()
+
+# -------------------------
+# Batched detection
+# -------------------------
+
+# Pack several short interactions into a single LLM call
+BATCH_DETECTION = os.getenv("BATCH_DETECTION", "false").lower() == "true"
+
+# Character budget of a single batch (~4 characters per token)
+BATCH_MAX_CHARS = int(os.getenv("BATCH_MAX_CHARS", "4000"))
+
+# Max number of interactions in a single batch
+BATCH_MAX_INTERACTIONS = int(os.getenv("BATCH_MAX_INTERACTIONS", "20"))
+
+# -------------------------
+# Chunked detection
+# -------------------------
+
+# Interaction bodies longer than this are split into overlapping windows detected
+# concurrently (0 disables chunking)
+DETECTION_CHUNK_MAX_CHARS = int(os.getenv("DETECTION_CHUNK_MAX_CHARS", "6000"))
+
+# Characters shared by two consecutive windows, should be longer than any PII value
+DETECTION_CHUNK_OVERLAP_CHARS = int(os.getenv("DETECTION_CHUNK_OVERLAP_CHARS", "300"))
+
+# -------------------------
+# Detection cache
+# -------------------------
+
+# Reuse detection results for identical interaction bodies
+DETECTION_CACHE_ENABLED = os.getenv("DETECTION_CACHE_ENABLED", "true").lower() == "true"
+
+# Max number of results kept in memory (LRU)
+DETECTION_CACHE_MAX_ENTRIES = int(os.getenv("DETECTION_CACHE_MAX_ENTRIES", "10000"))
+
+# Time to live of a cached result, in seconds
+DETECTION_CACHE_TTL_SECONDS = float(os.getenv("DETECTION_CACHE_TTL_SECONDS", "86400"))
+
+# Optional SQLite file to persist the cache across restarts and share it between workers
+DETECTION_CACHE_PATH = os.getenv("DETECTION_CACHE_PATH") or None
+
+# -------------------------
+# Request coalescing
+# -------------------------
+
+# Concurrent redactions of the same ticket share a single run; a run waits this long
+# before starting, so a burst of webhooks for one ticket collapses into one run (0 = no wait)
+REDACTION_DEBOUNCE_SECONDS = float(os.getenv("REDACTION_DEBOUNCE_SECONDS", "0"))
+
+# -------------------------
+# Incremental re-redaction
+# -------------------------
+
+# Optional SQLite file recording processed interactions per ticket: re-running a ticket
+# only detects new or edited interactions (disabled when unset)
+TICKET_STATE_PATH = os.getenv("TICKET_STATE_PATH") or None
+
+# -------------------------
+# Token vault
+# -------------------------
+
+# Optional SQLite file mapping the `tokenize` strategy's tokens back to the original values,
+# for `POST /detokenize` (disabled when unset: tokens are then one-way digests)
+TOKEN_VAULT_PATH = os.getenv("TOKEN_VAULT_PATH") or None
+
+# Most recently used tokens kept in memory in front of the vault file
+TOKEN_VAULT_HOT_SIZE = int(os.getenv("TOKEN_VAULT_HOT_SIZE", "100000"))
+
+# -------------------------
+# Regex pre-detection
+# -------------------------
+
+# Find structured PII (emails, phones, SSNs, IPs, cards) without the LLM and
+# skip the LLM for interactions without name/address-like content
+# (off by default until its false negatives are measured on real tickets)
+PRE_DETECTION = os.getenv("PRE_DETECTION", "false").lower() == "true"
+
+# -------------------------
+# Known entities
+# -------------------------
+
+# PII confirmed in one interaction of a ticket is matched (ignoring case and whitespace)
+# in the ticket's other interactions; shorter values are ignored (0 disables the matching)
+KNOWN_ENTITY_MIN_LENGTH = int(os.getenv("KNOWN_ENTITY_MIN_LENGTH", "4"))
+
+# -------------------------
+# Bulk redaction jobs
+# -------------------------
+
+# Number of worker tasks draining the bulk redaction queue
+BULK_WORKERS = int(os.getenv("BULK_WORKERS", "4"))
+
+# Max number of tickets waiting in the queue, new jobs are rejected with 429 above it
+BULK_QUEUE_SIZE = int(os.getenv("BULK_QUEUE_SIZE", "10000"))
+
+# Number of finished jobs kept for status requests
+BULK_MAX_FINISHED_JOBS = int(os.getenv("BULK_MAX_FINISHED_JOBS", "1000"))
+
+# -------------------------
+# Webhook ingestion
+# -------------------------
+
+# Ticket events are collected for this long after the first one of a window, then redacted as one batch
+WEBHOOK_BATCH_WINDOW_SECONDS = float(os.getenv("WEBHOOK_BATCH_WINDOW_SECONDS", "1.0"))
+
+# A window closes earlier once it holds this many distinct tickets
+WEBHOOK_BATCH_MAX_TICKETS = int(os.getenv("WEBHOOK_BATCH_MAX_TICKETS", "100"))
+
+# Max number of events waiting for their window, new events are rejected with 429 above it
+WEBHOOK_QUEUE_SIZE = int(os.getenv("WEBHOOK_QUEUE_SIZE", "10000"))
+
+# Max number of batches redacted at the same time
+WEBHOOK_MAX_CONCURRENT_BATCHES = int(os.getenv("WEBHOOK_MAX_CONCURRENT_BATCHES", "2"))
+
+# -------------------------
+# CRM connectors
+# -------------------------
+
+# Base URLs of the CRM APIs (defaults point to the local stub CRM server)
+ZENDESK_BASE_URL = os.getenv("ZENDESK_BASE_URL", "http://localhost:8081")
+ZENDESK_API_TOKEN = os.getenv("ZENDESK_API_TOKEN")
+SALESFORCE_BASE_URL = os.getenv("SALESFORCE_BASE_URL", "http://localhost:8081")
+SALESFORCE_API_TOKEN = os.getenv("SALESFORCE_API_TOKEN")
+
+# Connection pool of every HTTP connector
+CRM_MAX_CONNECTIONS = int(os.getenv("CRM_MAX_CONNECTIONS", "20"))
+CRM_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("CRM_MAX_KEEPALIVE_CONNECTIONS", "10"))
+CRM_TIMEOUT_SECONDS = float(os.getenv("CRM_TIMEOUT_SECONDS", "10"))
+
+# Optional SQLite file with a generated corpus, served as the "sqlite" source for load tests
+# (see `sqlite_crm_connector.py`; disabled when unset)
+SQLITE_CRM_PATH = os.getenv("SQLITE_CRM_PATH") or None
+
+# Simulated CRM round trip added to every call of the "sqlite" source
+SQLITE_CRM_LATENCY_MS = float(os.getenv("SQLITE_CRM_LATENCY_MS", "0"))
+
+# Max number of redacted tickets written per transaction of the "sqlite" source
+SQLITE_CRM_WRITE_BATCH_SIZE = int(os.getenv("SQLITE_CRM_WRITE_BATCH_SIZE", "500"))
+
+# -------------------------
+# Logging
+# -------------------------
+
+# Level of the app logger (DEBUG also logs ticket contents and detected PII)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+
+# -------------------------
+# Startup
+# -------------------------
+
+# Import google.adk and build the detection agents in the background right after startup
+# (otherwise on the first detection or the first call to /ready)
+WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "true").lower() == "true"
+
+# -------------------------
+# Health
+# -------------------------
+
+# Resident memory above which /health reports the instance as unhealthy (0 = no limit)
+MEMORY_CEILING_MB = float(os.getenv("MEMORY_CEILING_MB", "0"))
+
+# -------------------------
+# LLM rate limits and retries
+# -------------------------
+
+# Quota of the LLM backend, per minute (0 = no limit)
+LLM_REQUESTS_PER_MINUTE = float(os.getenv("LLM_REQUESTS_PER_MINUTE", "0"))
+LLM_TOKENS_PER_MINUTE = float(os.getenv("LLM_TOKENS_PER_MINUTE", "0"))
+
+# Floor of the adaptive concurrency limit when the backend keeps answering 429/503
+LLM_MIN_CONCURRENCY = int(os.getenv("LLM_MIN_CONCURRENCY", "1"))
+
+# Retries of transient LLM errors: total time budget and backoff bounds, in seconds
+LLM_RETRY_DEADLINE_SECONDS = float(os.getenv("LLM_RETRY_DEADLINE_SECONDS", "60"))
+LLM_RETRY_BASE_DELAY_SECONDS = float(os.getenv("LLM_RETRY_BASE_DELAY_SECONDS", "0.5"))
+LLM_RETRY_MAX_DELAY_SECONDS = float(os.getenv("LLM_RETRY_MAX_DELAY_SECONDS", "10"))
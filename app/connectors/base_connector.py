@@ -0,0 +1,45 @@
+import asyncio
+from abc import ABC, abstractmethod
+from typing import List
+
+from app.models.pydentic_model import Ticket, RedactedTicket
+
+
+class CRMConnector(ABC):
+    """
+    Async interface every CRM connector implements.
+
+    A connector instance is created once per source at startup (see `connector_registry`)
+    and shared by all requests, so it can keep pooled connections open.
+    """
+
+    @abstractmethod
+    async def fetch_ticket(self, ticket_id: str) -> Ticket: ...
+
+    @abstractmethod
+    async def update_ticket(self, ticket: RedactedTicket) -> None: ...
+
+    async def fetch_tickets(self, ticket_ids: List[str]) -> List[Ticket]:
+        """
+        Fetch several tickets; tickets which are not found are left out.
+        Override when the CRM has a bulk endpoint.
+        """
+        results = await asyncio.gather(*(self.fetch_ticket(ticket_id) for ticket_id in ticket_ids),
+                                       return_exceptions=True)
+        tickets: List[Ticket] = []
+        for result in results:
+            # connectors raise ValueError for unknown ticket IDs
+            if isinstance(result, ValueError):
+                continue
+            if isinstance(result, BaseException):
+                raise result
+            tickets.append(result)
+
+        return tickets
+
+    async def update_tickets(self, tickets: List[RedactedTicket]) -> None:
+        """Update several tickets; override when the CRM has a bulk endpoint."""
+        await asyncio.gather(*(self.update_ticket(ticket) for ticket in tickets))
+
+    async def aclose(self) -> None:
+        """Release network resources (connection pools etc.)."""
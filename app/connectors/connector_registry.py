@@ -1,16 +1,76 @@
-from importlib import import_module
-from app.models.pydentic_model import RedactedTicket
+from typing import Callable, Dict, List
 
-_CONNECTORS = {
-    "test": "app.connectors.test_crm_connector",
-    "zendesk":  "app.connectors.zendesk_crm_connector",
-    "salesforce": "app.connectors.zendesk_crm_connector",
+from app.connectors.base_connector import CRMConnector
+from app.connectors.test_crm_connector import TestCRMConnector
+from app.connectors.http_crm_connector import HttpCRMConnector
+from app.connectors.sqlite_crm_connector import SqliteCRMConnector
+from app.models.pydentic_model import Ticket, RedactedTicket
+from app.config.settings import (ZENDESK_BASE_URL, ZENDESK_API_TOKEN, SALESFORCE_BASE_URL, SALESFORCE_API_TOKEN,
+                                 CRM_MAX_CONNECTIONS, CRM_MAX_KEEPALIVE_CONNECTIONS, CRM_TIMEOUT_SECONDS,
+                                 SQLITE_CRM_PATH, SQLITE_CRM_LATENCY_MS, SQLITE_CRM_WRITE_BATCH_SIZE)
+
+
+def _http_connector(base_url: str, api_token: str) -> Callable[[], CRMConnector]:
+    return lambda: HttpCRMConnector(base_url=base_url,
+                                    api_token=api_token,
+                                    max_connections=CRM_MAX_CONNECTIONS,
+                                    max_keepalive_connections=CRM_MAX_KEEPALIVE_CONNECTIONS,
+                                    timeout_seconds=CRM_TIMEOUT_SECONDS)
+
+
+_CONNECTORS: Dict[str, Callable[[], CRMConnector]] = {
+    "test": TestCRMConnector,
+    "zendesk":  _http_connector(ZENDESK_BASE_URL, ZENDESK_API_TOKEN),
+    "salesforce": _http_connector(SALESFORCE_BASE_URL, SALESFORCE_API_TOKEN),
 }
 
-def fetch_ticket(source: str, ticket_id: int):
-    return import_module(_CONNECTORS[source]).fetch_ticket(
-        ticket_id=ticket_id
-    )
+if SQLITE_CRM_PATH:
+    _CONNECTORS["sqlite"] = lambda: SqliteCRMConnector(path=SQLITE_CRM_PATH,
+                                                       latency_ms=SQLITE_CRM_LATENCY_MS,
+                                                       write_batch_size=SQLITE_CRM_WRITE_BATCH_SIZE)
+
+# Connector instances, created once per source and shared by all requests
+_INSTANCES: Dict[str, CRMConnector] = {}
+
+
+async def init_connectors() -> None:
+    """Resolve all registered connectors, called once at app startup."""
+    for source in _CONNECTORS:
+        get_connector(source)
+
+
+async def close_connectors() -> None:
+    for connector in _INSTANCES.values():
+        await connector.aclose()
+    _INSTANCES.clear()
+
+
+def register_connector(source: str, factory: Callable[[], CRMConnector]) -> None:
+    """Adds (or replaces) a data source at runtime, e.g. for benchmarks or load tests."""
+    _CONNECTORS[source] = factory
+    _INSTANCES.pop(source, None)
+
+
+def get_connector(source: str) -> CRMConnector:
+    connector = _INSTANCES.get(source)
+    if connector is None:
+        if source not in _CONNECTORS:
+            raise ValueError(f"Unknown data source: {source}")
+        connector = _INSTANCES[source] = _CONNECTORS[source]()
+    return connector
+
+
+async def fetch_ticket(source: str, ticket_id: str) -> Ticket:
+    return await get_connector(source).fetch_ticket(ticket_id)
+
+
+async def update_ticket(source: str, redacted_ticket: RedactedTicket) -> None:
+    await get_connector(source).update_ticket(redacted_ticket)
+
+
+async def fetch_tickets(source: str, ticket_ids: List[str]) -> List[Ticket]:
+    return await get_connector(source).fetch_tickets(ticket_ids)
+
 
-def update_ticket(source: str, redacted_ticket: RedactedTicket):
-    return import_module(_CONNECTORS[source]).update_ticket(redacted_ticket)
+async def update_tickets(source: str, redacted_tickets: List[RedactedTicket]) -> None:
+    await get_connector(source).update_tickets(redacted_tickets)
@@ -0,0 +1,87 @@
+# Generic REST CRM connector
+# -----------------------------------------------------------------------------
+# Purpose
+# -------
+# Talk to a CRM over HTTP with a pooled, keep-alive `httpx.AsyncClient`.
+# Expected API (implemented by `stub_crm_server.py` for offline runs):
+#
+#   GET  /tickets/{id}          → {"id": str, "interactions": [{"id": str, "interaction_body": str}]}
+#   PUT  /tickets/{id}          ← RedactedTicket
+#   POST /tickets/bulk-fetch    ← {"ids": [str]}           → {"tickets": [ticket, ...]}
+#   POST /tickets/bulk-update   ← {"tickets": [RedactedTicket, ...]}
+# -----------------------------------------------------------------------------
+from typing import List, Optional
+
+import httpx
+
+from app.connectors.base_connector import CRMConnector
+from app.models.pydentic_model import Ticket, RedactedTicket, Interaction
+
+
+class HttpCRMConnector(CRMConnector):
+
+    # Max number of tickets per bulk request
+    BULK_SIZE = 100
+
+    def __init__(self,
+                 base_url: str,
+                 api_token: Optional[str] = None,
+                 max_connections: int = 20,
+                 max_keepalive_connections: int = 10,
+                 timeout_seconds: float = 10.0):
+        headers = {"Authorization": f"Bearer {api_token}"} if api_token else {}
+
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            headers=headers,
+            timeout=timeout_seconds,
+            limits=httpx.Limits(max_connections=max_connections,
+                                max_keepalive_connections=max_keepalive_connections),
+        )
+
+    async def fetch_ticket(self, ticket_id: str) -> Ticket:
+        response = await self._client.get(f"/tickets/{ticket_id}")
+        if response.status_code == 404:
+            raise ValueError(f"Ticket ID {ticket_id} not found in {self._client.base_url}.")
+        response.raise_for_status()
+
+        return _to_ticket(response.json())
+
+    async def update_ticket(self, ticket: RedactedTicket) -> None:
+        response = await self._client.put(f"/tickets/{ticket.ticket_id}",
+                                          content=ticket.model_dump_json(),
+                                          headers={"Content-Type": "application/json"})
+        response.raise_for_status()
+
+    async def fetch_tickets(self, ticket_ids: List[str]) -> List[Ticket]:
+        tickets: List[Ticket] = []
+
+        for i in range(0, len(ticket_ids), self.BULK_SIZE):
+            response = await self._client.post("/tickets/bulk-fetch", json={"ids": ticket_ids[i:i + self.BULK_SIZE]})
+            response.raise_for_status()
+            tickets.extend(_to_ticket(raw_ticket) for raw_ticket in response.json()["tickets"])
+
+        return tickets
+
+    async def update_tickets(self, tickets: List[RedactedTicket]) -> None:
+        for i in range(0, len(tickets), self.BULK_SIZE):
+            payload = {"tickets": [ticket.model_dump() for ticket in tickets[i:i + self.BULK_SIZE]]}
+            response = await self._client.post("/tickets/bulk-update", json=payload)
+            response.raise_for_status()
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+def _to_ticket(raw_ticket: dict) -> Ticket:
+    """Adapt CRM field names to match schemas: interaction "id" → "interaction_id"."""
+    return Ticket(
+        ticket_id=raw_ticket["id"],
+        interactions=[
+            Interaction(
+                interaction_id=interaction["id"],
+                interaction_body=interaction["interaction_body"]
+            )
+            for interaction in raw_ticket["interactions"]
+        ]
+    )
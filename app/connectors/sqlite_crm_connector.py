@@ -0,0 +1,187 @@
+# SQLite stand-in CRM connector
+# -----------------------------------------------------------------------------
+# Purpose
+# -------
+# Serve a large synthetic corpus (millions of tickets) from an indexed SQLite
+# file, so the whole pipeline can be load-tested without a real CRM:
+#
+#   tickets           (id PRIMARY KEY, interactions)     ← generated corpus
+#   redacted_tickets  (id PRIMARY KEY, body, updated_at)  ← RedactedTicket JSON
+#
+# Redacted tickets are kept apart from the corpus, so it can be redacted again.
+# Fill the file with:
+#   python -m benchmarks.generate_crm crm.sqlite --tickets 1000000
+#
+# - lookups are primary-key reads in worker threads, one connection per thread;
+# - updates are group-committed: updates waiting while a transaction runs are
+#   written together in the next one (up to `write_batch_size` tickets);
+# - `latency_ms` delays every call, as a network round trip to the CRM would.
+# -----------------------------------------------------------------------------
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Deque, Iterable, List, Optional, Tuple
+
+from app.connectors.base_connector import CRMConnector
+from app.models.pydentic_model import Ticket, RedactedTicket, Interaction
+from app.utils.sqlite_store import LOOKUP_CHUNK, connect_sqlite
+
+
+class SqliteCRMConnector(CRMConnector):
+
+    def __init__(self, path: str, latency_ms: float = 0.0, write_batch_size: int = 500):
+        self.path = path
+        self.latency_seconds = latency_ms / 1000
+        self.write_batch_size = write_batch_size
+
+        self._db = connect_sqlite(path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS tickets (id TEXT PRIMARY KEY, interactions TEXT NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS redacted_tickets ("
+            "id TEXT PRIMARY KEY, body TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+
+        # read connections, one per worker thread
+        self._local = threading.local()
+        self._readers: List[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
+
+        # (ticket ID, RedactedTicket JSON) rows waiting for the next transaction, with their callers
+        self._pending: Deque[Tuple[List[Tuple[str, str]], asyncio.Future]] = deque()
+        self._writer: Optional[asyncio.Task] = None
+
+    # ---------------------------------------------------------
+    # CRMConnector
+    # ---------------------------------------------------------
+
+    async def fetch_ticket(self, ticket_id: str) -> Ticket:
+        await asyncio.sleep(self.latency_seconds)
+        tickets = await asyncio.to_thread(self._read, [ticket_id])
+        if not tickets:
+            raise ValueError(f"Ticket ID {ticket_id} not found in {self.path}.")
+        return tickets[0]
+
+    async def fetch_tickets(self, ticket_ids: List[str]) -> List[Ticket]:
+        await asyncio.sleep(self.latency_seconds)
+        return await asyncio.to_thread(self._read, ticket_ids)
+
+    async def update_ticket(self, ticket: RedactedTicket) -> None:
+        await self.update_tickets([ticket])
+
+    async def update_tickets(self, tickets: List[RedactedTicket]) -> None:
+        await asyncio.sleep(self.latency_seconds)
+        if not tickets:
+            return
+
+        done = asyncio.get_running_loop().create_future()
+        self._pending.append(([(t.ticket_id, t.model_dump_json()) for t in tickets], done))
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.create_task(self._write_pending())
+
+        # returns once the ticket is committed, like a CRM acknowledging the update
+        await done
+
+    async def aclose(self) -> None:
+        if self._writer is not None:
+            await self._writer
+        with self._readers_lock:
+            for db in self._readers:
+                db.close()
+            self._readers.clear()
+        self._db.close()
+
+    # ---------------------------------------------------------
+    # Corpus
+    # ---------------------------------------------------------
+
+    def import_tickets(self, raw_tickets: Iterable[dict], batch_size: int = 10_000) -> int:
+        """
+        Inserts (or replaces) tickets in the `mock_db.json` shape, `batch_size` per transaction.
+        Synchronous: meant for the corpus generator, not for the running app. Returns the number of tickets.
+        """
+        count = 0
+        batch: List[Tuple[str, str]] = []
+
+        for raw_ticket in raw_tickets:
+            batch.append((raw_ticket["id"], json.dumps(raw_ticket["interactions"])))
+            if len(batch) >= batch_size:
+                count += self._insert_tickets(batch)
+                batch = []
+        if batch:
+            count += self._insert_tickets(batch)
+
+        return count
+
+    def count_tickets(self) -> Tuple[int, int]:
+        """Numbers of tickets in the corpus and of redacted tickets."""
+        return (self._db.execute("SELECT COUNT(*) FROM tickets").fetchone()[0],
+                self._db.execute("SELECT COUNT(*) FROM redacted_tickets").fetchone()[0])
+
+    # ---------------------------------------------------------
+    # Internals
+    # ---------------------------------------------------------
+
+    def _reader(self) -> sqlite3.Connection:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = self._local.db = connect_sqlite(self.path)
+            with self._readers_lock:
+                self._readers.append(db)
+        return db
+
+    def _read(self, ticket_ids: List[str]) -> List[Ticket]:
+        """Tickets in the order of `ticket_ids`; unknown IDs are left out."""
+        db = self._reader()
+        rows = {}
+        for i in range(0, len(ticket_ids), LOOKUP_CHUNK):
+            chunk = ticket_ids[i:i + LOOKUP_CHUNK]
+            rows.update(db.execute(
+                f"SELECT id, interactions FROM tickets WHERE id IN ({','.join('?' * len(chunk))})", chunk
+            ).fetchall())
+
+        return [_to_ticket(ticket_id, rows[ticket_id]) for ticket_id in dict.fromkeys(ticket_ids)
+                if ticket_id in rows]
+
+    async def _write_pending(self) -> None:
+        while self._pending:
+            # whole caller groups, until the batch is full
+            batch, rows = [], []
+            while self._pending and (not rows or len(rows) + len(self._pending[0][0]) <= self.write_batch_size):
+                group, done = self._pending.popleft()
+                batch.append(done)
+                rows.extend(group)
+
+            try:
+                await asyncio.to_thread(self._write, rows)
+            except Exception as e:
+                for done in batch:
+                    if not done.done():
+                        done.set_exception(e)
+            else:
+                for done in batch:
+                    if not done.done():
+                        done.set_result(None)
+
+    def _write(self, rows: List[Tuple[str, str]]) -> None:
+        now = time.time()
+        with self._db:
+            self._db.execute("BEGIN")
+            self._db.executemany("INSERT OR REPLACE INTO redacted_tickets (id, body, updated_at) VALUES (?, ?, ?)",
+                                 [(ticket_id, body, now) for ticket_id, body in rows])
+
+    def _insert_tickets(self, rows: List[Tuple[str, str]]) -> int:
+        with self._db:
+            self._db.execute("BEGIN")
+            self._db.executemany("INSERT OR REPLACE INTO tickets (id, interactions) VALUES (?, ?)", rows)
+        return len(rows)
+
+
+def _to_ticket(ticket_id: str, interactions: str) -> Ticket:
+    return Ticket(ticket_id=ticket_id,
+                  interactions=[Interaction(interaction_id=i["id"], interaction_body=i["interaction_body"])
+                                for i in json.loads(interactions)])
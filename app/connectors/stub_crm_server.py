@@ -0,0 +1,68 @@
+# Stand-in CRM server
+# -----------------------------------------------------------------------------
+# Purpose
+# -------
+# Local HTTP server implementing the API expected by `HttpCRMConnector`, so the
+# "zendesk" / "salesforce" sources can be exercised and load-tested offline.
+# Tickets are served from `mock_db.json`, updates are kept in memory.
+#
+# Run it with:
+#   uvicorn app.connectors.stub_crm_server:app --port 8081
+#
+# STUB_CRM_LATENCY_MS adds an artificial delay to every request.
+# -----------------------------------------------------------------------------
+import asyncio
+import json
+import os
+from typing import Dict, List
+
+from fastapi import FastAPI, HTTPException
+from pydantic import BaseModel
+
+from app.models.pydentic_model import RedactedTicket
+
+LATENCY_SECONDS = float(os.getenv("STUB_CRM_LATENCY_MS", "0")) / 1000
+
+with open(os.path.join(os.path.dirname(__file__), "mock_db.json"), "r", encoding="utf-8") as f:
+    TICKETS: Dict[str, dict] = {t["id"]: t for t in json.load(f)["mock_database"]}
+
+# Redacted tickets received from the app, by ticket ID
+UPDATED: Dict[str, RedactedTicket] = {}
+
+
+class BulkFetchRequest(BaseModel):
+    ids: List[str]
+
+
+class BulkUpdateRequest(BaseModel):
+    tickets: List[RedactedTicket]
+
+
+app = FastAPI(title="Stub CRM")
+
+
+@app.get("/tickets/{ticket_id}")
+async def get_ticket(ticket_id: str):
+    await asyncio.sleep(LATENCY_SECONDS)
+    if ticket_id not in TICKETS:
+        raise HTTPException(status_code=404, detail=f"Ticket {ticket_id} not found")
+    return TICKETS[ticket_id]
+
+
+@app.put("/tickets/{ticket_id}", status_code=204)
+async def put_ticket(ticket_id: str, ticket: RedactedTicket):
+    await asyncio.sleep(LATENCY_SECONDS)
+    UPDATED[ticket_id] = ticket
+
+
+@app.post("/tickets/bulk-fetch")
+async def bulk_fetch(request: BulkFetchRequest):
+    await asyncio.sleep(LATENCY_SECONDS)
+    return {"tickets": [TICKETS[ticket_id] for ticket_id in request.ids if ticket_id in TICKETS]}
+
+
+@app.post("/tickets/bulk-update", status_code=204)
+async def bulk_update(request: BulkUpdateRequest):
+    await asyncio.sleep(LATENCY_SECONDS)
+    for ticket in request.tickets:
+        UPDATED[ticket.ticket_id] = ticket
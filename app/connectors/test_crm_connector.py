@@ -7,21 +7,26 @@
 # -----------------------------------------------------------------------------
 import json
 import os
+from functools import lru_cache
+from typing import Dict
 
+from app.connectors.base_connector import CRMConnector
 from app.models.pydentic_model import Ticket, RedactedTicket, Interaction
- 
-# Load JSON from file
-with open(os.path.join(os.path.dirname(__file__), "mock_db.json"), "r", encoding="utf-8") as f:
-    raw_data = json.load(f)
 
-# Convert list of tickets into a dict for easy lookup by ticket ID
-RAW_DB = {t["id"]: t for t in raw_data["mock_database"]}
 
+@lru_cache(maxsize=None)
+def get_raw_db() -> Dict[str, dict]:
+    """Tickets of the test JSON file by ticket ID, loaded on first use (not at import)."""
+    with open(os.path.join(os.path.dirname(__file__), "mock_db.json"), "r", encoding="utf-8") as f:
+        raw_data = json.load(f)
+
+    # Convert list of tickets into a dict for easy lookup by ticket ID
+    return {t["id"]: t for t in raw_data["mock_database"]}
 
 
 def fetch_ticket(ticket_id: str) -> Ticket:
     """Fetch a ticket from the test JSON file and adapt field names to match schemas."""
-    raw_ticket = RAW_DB.get(ticket_id)
+    raw_ticket = get_raw_db().get(ticket_id)
     if not raw_ticket:
         raise ValueError(f"Ticket ID {ticket_id} not found in test database.")
 
@@ -45,3 +50,13 @@ def update_ticket(ticket: RedactedTicket) -> None:
     """Pretend to push the redacted ticket back – just print to console."""
     print("[TEST_CRM] Updated ticket", ticket.ticket_id)
     print("[TEST_CRM] INteractions:", ticket.interactions)
+
+
+class TestCRMConnector(CRMConnector):
+    """Async wrapper of the test JSON database; lookups are in memory and never block."""
+
+    async def fetch_ticket(self, ticket_id: str) -> Ticket:
+        return fetch_ticket(ticket_id)
+
+    async def update_ticket(self, ticket: RedactedTicket) -> None:
+        update_ticket(ticket)
@@ -1,12 +1,27 @@
 import os
+import json
+import asyncio
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Security, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, StreamingResponse, JSONResponse, Response
 from fastapi.security.api_key import APIKeyHeader
 
-from .models.pydentic_model import RedactedTicket, DataSourceRequest
-from .services.redaction_service import redact_ticket
+from typing import AsyncIterator, Literal, Optional
+
+from .models.pydentic_model import (RedactedTicket, DataSourceRequest, BulkRedactionRequest, BulkRedactionJob,
+                                    RedactedInteraction, DetokenizeRequest, DetokenizeResponse, DetokenizedValue,
+                                    TicketEvent)
+from .services.redaction_service import redact_ticket_once, redact_ticket_stream, token_vault
+from .utils.token_vault import TOKEN_PATTERN
+from .services.job_service import job_manager, JobQueueFull
+from .services.ingestion_service import webhook_ingestion
+from .connectors.connector_registry import init_connectors, close_connectors, get_connector
+from .agents.pii_detector_runner import active_sessions, warm_up, is_warm
+from .utils.runtime_stats import current_rss_bytes
+from .utils.metrics import render_metrics, PROMETHEUS_CONTENT_TYPE
+from .config.settings import MEMORY_CEILING_MB, WARMUP_ON_STARTUP
 
 from dotenv import load_dotenv
 
@@ -16,13 +31,44 @@ REDACTION_STRATEGY = os.getenv("REDACTION_STRATEGY", "mask")
 
 API_KEY_NAME = "x-api-key"
 API_KEY=os.getenv("FAST_API_KEY")
+# Separate key for `POST /detokenize`, which returns original PII values (disabled when unset)
+DETOKENIZE_API_KEY = os.getenv("DETOKENIZE_API_KEY")
 
 
 # -------------------------
 # App 
 # -------------------------
 
-app = FastAPI()
+# Background import of google.adk and build of the detection agents (see /ready)
+_warm_up_task: Optional[asyncio.Task] = None
+
+def _start_warm_up() -> asyncio.Task:
+    """Starts the warm-up, unless it is running or done; a failed one is started again."""
+    global _warm_up_task
+    if _warm_up_task is None or _warm_up_failed(_warm_up_task):
+        _warm_up_task = asyncio.create_task(asyncio.to_thread(warm_up))
+    return _warm_up_task
+
+
+def _warm_up_failed(task: asyncio.Task) -> bool:
+    return task.done() and (task.cancelled() or task.exception() is not None)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await init_connectors()
+    await job_manager.start()
+    await webhook_ingestion.start()
+    # not awaited: the app serves requests while the agents warm up
+    if WARMUP_ON_STARTUP:
+        _start_warm_up()
+    yield
+    await webhook_ingestion.stop()
+    await job_manager.stop()
+    await close_connectors()
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,          
@@ -45,6 +91,14 @@ async def get_api_key(api_key: str = Security(api_key_header)):
             status_code=status.HTTP_403_FORBIDDEN, detail="Could not validate API key"
         )
 
+async def get_detokenize_api_key(api_key: str = Security(api_key_header)):
+    if DETOKENIZE_API_KEY and api_key == DETOKENIZE_API_KEY:
+        return api_key
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Could not validate API key"
+        )
+
 # -------------------------
 # Routes
 # -------------------------
@@ -54,6 +108,54 @@ async def read_root():
     return "<h1>PII REDACTION TOOL IS RUNNING</h1>"
 
 
+@app.get("/health")
+async def health():
+    """
+    Liveness probe with memory gauges; returns 503 once RSS goes above MEMORY_CEILING_MB,
+    so the orchestrator can recycle the instance before it gets OOM-killed.
+    """
+    rss_mb = current_rss_bytes() / (1024 * 1024)
+    over_ceiling = MEMORY_CEILING_MB > 0 and rss_mb > MEMORY_CEILING_MB
+
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE if over_ceiling else status.HTTP_200_OK,
+        content={
+            "status": "memory_ceiling_exceeded" if over_ceiling else "ok",
+            "active_sessions": active_sessions(),
+            "rss_mb": round(rss_mb, 1),
+            "memory_ceiling_mb": MEMORY_CEILING_MB,
+        },
+    )
+
+
+@app.get("/ready")
+async def ready():
+    """
+    Readiness probe: 200 once the detection agents are built, 503 while they warm up
+    (the first call starts the warm-up if WARMUP_ON_STARTUP is off; a failed one is reported
+    and started again).
+    """
+    if is_warm():
+        return {"status": "ready"}
+
+    task = _warm_up_task
+    if task is not None and _warm_up_failed(task):
+        # retried right away, so a transient failure (e.g. a network blip) does not stick
+        detail = "cancelled" if task.cancelled() else str(task.exception())
+        _start_warm_up()
+        return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                            content={"status": "warm_up_failed", "detail": detail})
+
+    _start_warm_up()
+    return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content={"status": "warming_up"})
+
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus scrape endpoint: per-stage latency histograms, interaction counters, LLM and memory gauges."""
+    return Response(content=render_metrics(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
 
 @app.post("/ticket-redaction/{source}/{ticket_id}", response_model=RedactedTicket)
 async def ticket_redaction(source: str,
@@ -62,4 +164,127 @@ async def ticket_redaction(source: str,
     event = DataSourceRequest(source=source,
                               ticket_id=ticket_id)
 
-    return await redact_ticket(event=event, redaction_strategy=REDACTION_STRATEGY)
\ No newline at end of file
+    redacted_ticket = await redact_ticket_once(event=event, redaction_strategy=REDACTION_STRATEGY)
+
+    # serialized by pydantic-core in one call, skipping FastAPI's re-validation against `response_model`
+    return Response(content=redacted_ticket.model_dump_json(), media_type="application/json")
+
+
+@app.post("/ticket-redaction/{source}/{ticket_id}/stream")
+async def ticket_redaction_stream(source: str,
+                                  ticket_id: str,
+                                  format: Literal["ndjson", "sse"] = "ndjson",
+                                  api_key: str = Security(get_api_key)):
+    """
+    Streams every redacted interaction as soon as it is ready, then a final summary record.
+    Records are `{"type": "interaction" | "summary" | "error", "data": {...}}`,
+    sent as NDJSON lines or as Server-Sent Events (`event: <type>`).
+    """
+    event = DataSourceRequest(source=source,
+                              ticket_id=ticket_id)
+
+    media_type = "application/x-ndjson" if format == "ndjson" else "text/event-stream"
+
+    return StreamingResponse(_stream_records(event, format), media_type=media_type)
+
+
+async def _stream_records(event: DataSourceRequest, format: str) -> AsyncIterator[str]:
+    try:
+        async for item in redact_ticket_stream(event=event, redaction_strategy=REDACTION_STRATEGY):
+            record_type = "interaction" if isinstance(item, RedactedInteraction) else "summary"
+            yield _format_record(record_type, item.model_dump_json(), format)
+
+    except Exception as e:
+        # the response is already started, so errors can only be reported as a record
+        yield _format_record("error", json.dumps({"detail": str(e)}), format)
+
+
+def _format_record(record_type: str, data: str, format: str) -> str:
+    if format == "sse":
+        return f"event: {record_type}\ndata: {data}\n\n"
+
+    return f'{{"type": "{record_type}", "data": {data}}}\n'
+
+
+@app.post("/bulk-redaction/{source}", response_model=BulkRedactionJob, status_code=status.HTTP_202_ACCEPTED)
+async def bulk_redaction(source: str,
+                         request: BulkRedactionRequest,
+                         api_key: str = Security(get_api_key)):
+    try:
+        # unknown sources are rejected here rather than failing every ticket of the job
+        get_connector(source)
+        job = job_manager.submit(source=source,
+                                 ticket_ids=request.ticket_ids,
+                                 redaction_strategy=REDACTION_STRATEGY)
+    except JobQueueFull as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)},
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return job.to_model()
+
+
+@app.post("/webhooks/{source}", status_code=status.HTTP_202_ACCEPTED)
+async def ticket_webhook(source: str,
+                         event: TicketEvent,
+                         api_key: str = Security(get_api_key)):
+    """
+    Webhook for CRMs pushing ticket events: acknowledged right away, the ticket is redacted
+    with the other events of its time/size window in one batch (bulk fetch, pooled detection, bulk update).
+    """
+    try:
+        get_connector(source)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+    try:
+        webhook_ingestion.submit(source=source,
+                                 ticket_id=event.ticket_id,
+                                 redaction_strategy=REDACTION_STRATEGY)
+    except JobQueueFull as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)},
+        )
+
+    return {"status": "accepted"}
+
+
+@app.get("/bulk-redaction/jobs/{job_id}", response_model=BulkRedactionJob)
+async def bulk_redaction_job(job_id: str,
+                             api_key: str = Security(get_api_key)):
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Job {job_id} not found")
+
+    return job.to_model()
+
+
+@app.post("/detokenize", response_model=DetokenizeResponse)
+async def detokenize(request: DetokenizeRequest,
+                     api_key: str = Security(get_detokenize_api_key)):
+    """
+    Maps tokens of the `tokenize` strategy back to the original values (token vault only),
+    all of them resolved with batched lookups. Requires `DETOKENIZE_API_KEY`, not the regular API key.
+    """
+    if token_vault is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Token vault is not enabled")
+
+    # "{{label:token}}" as found in redacted text, or the bare token
+    token_ids = {}
+    for token in request.tokens:
+        match = TOKEN_PATTERN.fullmatch(token)
+        token_ids[token] = match.group(2) if match else token
+
+    resolved = await token_vault.resolve(token_ids.values())
+
+    return DetokenizeResponse(
+        values={token: DetokenizedValue(label=resolved[token_id][0], value=resolved[token_id][1])
+                for token, token_id in token_ids.items() if token_id in resolved},
+        missing=[token for token, token_id in token_ids.items() if token_id not in resolved],
+    )
@@ -1,4 +1,4 @@
-from typing import List
+from typing import Dict, List
 from pydantic import BaseModel, Field, ConfigDict
 
 # ---------------------------------------------------------
@@ -138,3 +138,121 @@ class RedactedTicket(BaseModel):
            
         }
     })
+
+
+# ---------------------------------------------------------
+# Bulk redaction: many tickets processed in background
+# ---------------------------------------------------------
+
+class BulkRedactionRequest(BaseModel):
+    ticket_ids: List[str] = Field(..., min_length=1)
+    model_config = ConfigDict(
+        title="Bulk Redaction Request",
+        description="A list of ticket IDs of one data source to be redacted in background.",
+        json_schema_extra={
+        "example": {
+            "ticket_ids": ["2001", "2002", "2003"]
+        }
+    })
+
+
+class BulkRedactionJob(BaseModel):
+    job_id: str
+    source: str
+    status: str
+    total: int
+    processed: int
+    succeeded: int
+    failed: int
+    errors: Dict[str, str]
+    model_config = ConfigDict(
+        title="Bulk Redaction Job",
+        description="Status and progress of a bulk redaction job. Status is one of `queued`, `running` or `completed`; `errors` maps failed ticket IDs to the error message.",
+        json_schema_extra={
+        "example": {
+            "job_id": "5f0c4b8e2a9d4c1b9e3f6a7d8c9b0a1e",
+            "source": "zendesk",
+            "status": "running",
+            "total": 3,
+            "processed": 2,
+            "succeeded": 1,
+            "failed": 1,
+            "errors": {"2002": "Ticket ID 2002 not found in test database."}
+        }
+    })
+
+
+# ---------------------------------------------------------
+# Webhook ingestion: ticket events pushed by the CRM
+# ---------------------------------------------------------
+
+class TicketEvent(BaseModel):
+    ticket_id: str
+    model_config = ConfigDict(
+        title="Ticket Event",
+        description="Webhook event of a data source: a ticket was created or updated and has to be redacted.",
+        json_schema_extra={
+        "example": {
+            "ticket_id": "123456"
+        }
+    })
+
+
+# ---------------------------------------------------------
+# Token vault: tokens mapped back to the original values
+# ---------------------------------------------------------
+
+class DetokenizeRequest(BaseModel):
+    tokens: List[str] = Field(..., min_length=1, max_length=10000)
+    model_config = ConfigDict(
+        title="Detokenize Request",
+        description="Tokens produced by the `tokenize` strategy, either as they appear in the redacted text (`{{label:token}}`) or bare.",
+        json_schema_extra={
+        "example": {
+            "tokens": ["{{name:9f2c4e1ab07d3c55}}", "41d07a9c2e6b8f30"]
+        }
+    })
+
+
+class DetokenizedValue(BaseModel):
+    label: str
+    value: str
+
+
+class DetokenizeResponse(BaseModel):
+    values: Dict[str, DetokenizedValue]
+    missing: List[str]
+    model_config = ConfigDict(
+        title="Detokenize Response",
+        description="Original values by requested token; tokens unknown to the vault are listed in `missing`.",
+        json_schema_extra={
+        "example": {
+            "values": {"{{name:9f2c4e1ab07d3c55}}": {"label": "name", "value": "John Doe"}},
+            "missing": ["41d07a9c2e6b8f30"]
+        }
+    })
+
+
+# ---------------------------------------------------------
+# Streaming: final record sent after all redacted interactions
+# ---------------------------------------------------------
+
+class RedactionSummary(BaseModel):
+    ticket_id: str
+    total_interactions: int
+    redacted_interactions: int
+    skipped_interactions: int
+    # interactions sent again with entities confirmed later in the ticket
+    corrected_interactions: int = 0
+    model_config = ConfigDict(
+        title="Redaction Summary",
+        description="Final record of a streamed ticket redaction, sent once the redacted ticket is pushed back to the data source.",
+        json_schema_extra={
+        "example": {
+            "ticket_id": "123456",
+            "total_interactions": 3,
+            "redacted_interactions": 2,
+            "skipped_interactions": 1,
+            "corrected_interactions": 0
+        }
+    })
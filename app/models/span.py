@@ -0,0 +1,83 @@
+from typing import Annotated, Any, List, NamedTuple
+
+from pydantic import Field, TypeAdapter
+# pydantic needs the typing_extensions version on Python < 3.12
+from typing_extensions import TypedDict
+
+from app.models.pydentic_model import PIIEntity
+
+
+# ---------------------------------------------------------
+# Detected PII span, internal representation
+# ---------------------------------------------------------
+
+class Span(NamedTuple):
+    """
+    A detected PII span as passed between detection, merging and redaction:
+    a plain tuple with the `start`/`end`/`label` attributes of `PIIEntity`,
+    without per-instance validation.
+    LLM answers are validated once, when parsed (`parse_llm_entities`, `parse_llm_span_texts`);
+    API models are only built for the response, with `to_pii_entities`.
+    """
+    start: int
+    end: int
+    label: str
+
+
+# ---------------------------------------------------------
+# Validation of LLM answers (the trust boundary)
+# ---------------------------------------------------------
+
+class _LLMEntity(TypedDict):
+    start: Annotated[int, Field(ge=0)]
+    end: Annotated[int, Field(ge=1)]
+    label: str
+
+
+class _LLMSpanText(TypedDict):
+    label: str
+    text: str
+
+
+class _LLMBatchSpanText(TypedDict):
+    interaction: int
+    label: str
+    text: str
+
+
+# validating a whole list at once is a single call into pydantic-core
+_LLM_ENTITIES = TypeAdapter(List[_LLMEntity])
+_PII_ENTITIES = TypeAdapter(List[PIIEntity])
+_LLM_SPAN_TEXTS = TypeAdapter(List[_LLMSpanText])
+_LLM_BATCH_SPAN_TEXTS = TypeAdapter(List[_LLMBatchSpanText])
+
+
+def parse_llm_entities(payload: Any) -> List[Span]:
+    """`[{"start", "end", "label"}]` answer → spans. Raises `ValidationError` on malformed items."""
+    return [Span(e["start"], e["end"], e["label"]) for e in _LLM_ENTITIES.validate_python(payload)]
+
+
+def parse_llm_span_texts(payload: Any) -> List[dict]:
+    """`[{"label", "text"}]` answer, validated. Raises `ValidationError` on malformed items."""
+    return _LLM_SPAN_TEXTS.validate_python(payload)
+
+
+def parse_llm_batch_span_texts(payload: Any) -> List[dict]:
+    """`[{"interaction", "label", "text"}]` answer, validated. Raises `ValidationError` on malformed items."""
+    return _LLM_BATCH_SPAN_TEXTS.validate_python(payload)
+
+
+# ---------------------------------------------------------
+# Conversion from/to the API model
+# ---------------------------------------------------------
+
+def to_pii_entities(spans: List[Span]) -> List[PIIEntity]:
+    """
+    API entities, built by pydantic-core in a single call
+    (several times cheaper than a Python-level `model_construct` per entity).
+    """
+    return _PII_ENTITIES.validate_python([{"start": s.start, "end": s.end, "label": s.label} for s in spans])
+
+
+def from_pii_entities(entities: List[PIIEntity]) -> List[Span]:
+    return [Span(e.start, e.end, e.label) for e in entities]
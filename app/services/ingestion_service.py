@@ -0,0 +1,126 @@
+import asyncio
+import math
+from typing import Dict, List, Optional, Set, Tuple
+
+from app.services.job_service import JobQueueFull
+from app.services.redaction_service import redact_tickets_batch
+from app.utils.metrics import WEBHOOK_EVENTS, WEBHOOK_TICKETS_FAILED, Gauge
+from app.config.settings import (WEBHOOK_BATCH_WINDOW_SECONDS, WEBHOOK_BATCH_MAX_TICKETS, WEBHOOK_QUEUE_SIZE,
+                                 WEBHOOK_MAX_CONCURRENT_BATCHES)
+
+from app.config.logger_config import setup_logger
+logger = setup_logger()
+
+# (source, redaction strategy): tickets of one window are batched per source
+_BatchKey = Tuple[str, str]
+
+
+class WebhookIngestion:
+    """
+    Ticket events pushed by CRM webhooks, acknowledged right away and redacted in micro-batches.
+
+    Events are collected over a window: it closes `window_seconds` after its first event,
+    or as soon as it holds `max_tickets` distinct tickets. Repeated events for a ticket within
+    a window count once. Every window is flushed as one batch per source (`redact_tickets_batch`),
+    at most `max_concurrent_batches` at a time; the collector waits for a free slot, so a
+    slow CRM or LLM fills the queue and new events get `JobQueueFull` instead of piling up.
+    """
+
+    def __init__(self, window_seconds: float, max_tickets: int, queue_size: int, max_concurrent_batches: int):
+        self.window_seconds = window_seconds
+        self.max_tickets = max_tickets
+        self.queue_size = queue_size
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._collector: Optional[asyncio.Task] = None
+        self._slots = asyncio.Semaphore(max_concurrent_batches)
+        self._batches: Set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._collector = asyncio.create_task(self._collect())
+        logger.info("📨 Webhook ingestion started (window %ss / %s tickets)", self.window_seconds, self.max_tickets)
+
+    async def stop(self) -> None:
+        """Flushes the events already accepted, then waits for the running batches."""
+        if self._collector is None:
+            return
+
+        # every event queued before the sentinel is still collected
+        await self._queue.put(None)
+        await self._collector
+        await asyncio.gather(*self._batches, return_exceptions=True)
+        self._collector = None
+
+    def submit(self, source: str, ticket_id: str, redaction_strategy: str) -> None:
+        try:
+            self._queue.put_nowait((source, redaction_strategy, ticket_id))
+        except asyncio.QueueFull:
+            raise JobQueueFull(retry_after=max(1, math.ceil(self.window_seconds))) from None
+
+        WEBHOOK_EVENTS.inc(source)
+
+    def pending(self) -> int:
+        """Events waiting for their window to close."""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def _collect(self) -> None:
+        loop = asyncio.get_running_loop()
+        closing = False
+
+        while not closing:
+            event = await self._queue.get()
+            if event is None:
+                break
+
+            # ticket IDs per batch, in arrival order and without repeats
+            window: Dict[_BatchKey, Dict[str, None]] = {}
+            tickets = 0
+            deadline = loop.time() + self.window_seconds
+
+            while True:
+                source, redaction_strategy, ticket_id = event
+                ticket_ids = window.setdefault((source, redaction_strategy), {})
+                if ticket_id not in ticket_ids:
+                    ticket_ids[ticket_id] = None
+                    tickets += 1
+
+                timeout = deadline - loop.time()
+                if tickets >= self.max_tickets or timeout <= 0:
+                    break
+                try:
+                    event = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if event is None:
+                    closing = True
+                    break
+
+            for (source, redaction_strategy), ticket_ids in window.items():
+                await self._slots.acquire()
+                task = asyncio.create_task(self._flush(source, list(ticket_ids), redaction_strategy))
+                self._batches.add(task)
+                task.add_done_callback(self._batches.discard)
+
+    async def _flush(self, source: str, ticket_ids: List[str], redaction_strategy: str) -> None:
+        try:
+            errors = await redact_tickets_batch(source, ticket_ids, redaction_strategy)
+        except Exception as e:
+            # webhooks are already acknowledged: the batch can only be logged as failed
+            logger.warning("⚠️ Webhook batch of %s tickets from %s failed — %s", len(ticket_ids), source, e)
+            errors = {ticket_id: str(e) for ticket_id in ticket_ids}
+        finally:
+            self._slots.release()
+
+        for ticket_id, error in errors.items():
+            logger.warning("⚠️ Webhook ticket %s from %s not redacted — %s", ticket_id, source, error)
+        if errors:
+            WEBHOOK_TICKETS_FAILED.inc(source, amount=len(errors))
+
+
+webhook_ingestion = WebhookIngestion(window_seconds=WEBHOOK_BATCH_WINDOW_SECONDS,
+                                     max_tickets=WEBHOOK_BATCH_MAX_TICKETS,
+                                     queue_size=WEBHOOK_QUEUE_SIZE,
+                                     max_concurrent_batches=WEBHOOK_MAX_CONCURRENT_BATCHES)
+Gauge("pii_webhook_events_pending", "Webhook events waiting for their batch window to close.",
+      function=webhook_ingestion.pending)
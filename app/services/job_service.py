@@ -0,0 +1,149 @@
+import asyncio
+import math
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from app.models.pydentic_model import DataSourceRequest, BulkRedactionJob
+from app.services.redaction_service import redact_ticket_once
+from app.config.settings import BULK_WORKERS, BULK_QUEUE_SIZE, BULK_MAX_FINISHED_JOBS
+
+from app.config.logger_config import setup_logger
+logger = setup_logger()
+
+
+class JobQueueFull(Exception):
+    """Raised when the queue has no room for all tickets of a new job."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Job queue is full, retry after {retry_after} seconds")
+        self.retry_after = retry_after
+
+
+@dataclass
+class Job:
+    job_id: str
+    source: str
+    redaction_strategy: str
+    total: int
+    succeeded: int = 0
+    failed: int = 0
+    started: bool = False
+    errors: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def processed(self) -> int:
+        return self.succeeded + self.failed
+
+    @property
+    def status(self) -> str:
+        if self.processed == self.total:
+            return "completed"
+        return "running" if self.started else "queued"
+
+    def to_model(self) -> BulkRedactionJob:
+        return BulkRedactionJob(job_id=self.job_id,
+                                source=self.source,
+                                status=self.status,
+                                total=self.total,
+                                processed=self.processed,
+                                succeeded=self.succeeded,
+                                failed=self.failed,
+                                errors=self.errors)
+
+
+class RedactionJobManager:
+    """
+    In-process queue of tickets to redact, drained by a pool of worker tasks.
+
+    A job is accepted only if the queue has room for all of its tickets,
+    otherwise `JobQueueFull` is raised with an estimate of when to retry.
+    """
+
+    def __init__(self, workers: int, queue_size: int, max_finished_jobs: int):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.max_finished_jobs = max_finished_jobs
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        # moving average of a single ticket processing time, used for Retry-After
+        self._avg_ticket_seconds = 1.0
+
+    async def start(self) -> None:
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._tasks = [asyncio.create_task(self._worker(n)) for n in range(self.workers)]
+        logger.info("🧵 Started %s bulk redaction workers", self.workers)
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def submit(self, source: str, ticket_ids: List[str], redaction_strategy: str) -> Job:
+        if len(ticket_ids) > self.queue_size:
+            raise ValueError(f"Too many tickets for one job, max {self.queue_size}")
+
+        free = self.queue_size - self._queue.qsize()
+        if len(ticket_ids) > free:
+            raise JobQueueFull(retry_after=self._estimate_retry_after(len(ticket_ids) - free))
+
+        job = Job(job_id=uuid.uuid4().hex,
+                  source=source,
+                  redaction_strategy=redaction_strategy,
+                  total=len(ticket_ids))
+        self._remember(job)
+
+        for ticket_id in ticket_ids:
+            self._queue.put_nowait((job, ticket_id))
+
+        logger.info("📥 Bulk job %s queued with %s tickets from %s", job.job_id, job.total, source)
+
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    async def _worker(self, number: int) -> None:
+        while True:
+            job, ticket_id = await self._queue.get()
+            job.started = True
+            started_at = time.perf_counter()
+
+            try:
+                await redact_ticket_once(event=DataSourceRequest(source=job.source, ticket_id=ticket_id),
+                                         redaction_strategy=job.redaction_strategy)
+                job.succeeded += 1
+
+            except Exception as e:
+                logger.warning("⚠️ Bulk job %s: ticket %s failed — %s", job.job_id, ticket_id, e)
+                job.failed += 1
+                job.errors[ticket_id] = str(e)
+
+            finally:
+                elapsed = time.perf_counter() - started_at
+                self._avg_ticket_seconds = 0.9 * self._avg_ticket_seconds + 0.1 * elapsed
+                self._queue.task_done()
+
+            if job.status == "completed":
+                logger.info("✅ Bulk job %s completed: %s succeeded, %s failed", job.job_id, job.succeeded, job.failed)
+
+    def _estimate_retry_after(self, missing_slots: int) -> int:
+        return max(1, math.ceil(missing_slots * self._avg_ticket_seconds / self.workers))
+
+    def _remember(self, job: Job) -> None:
+        self._jobs[job.job_id] = job
+
+        # forget the oldest finished jobs, running ones are always kept
+        finished = [job_id for job_id, j in self._jobs.items() if j.status == "completed"]
+        for job_id in finished[:max(0, len(finished) - self.max_finished_jobs)]:
+            del self._jobs[job_id]
+
+
+job_manager = RedactionJobManager(workers=BULK_WORKERS,
+                                  queue_size=BULK_QUEUE_SIZE,
+                                  max_finished_jobs=BULK_MAX_FINISHED_JOBS)
@@ -1,95 +1,630 @@
-from app.models.pydentic_model import DataSourceRequest, RedactedTicket, Ticket, Interaction, RedactedInteraction
-from typing import List
-from app.connectors.connector_registry import fetch_ticket, update_ticket
-from app.utils.pii_redactor import redact_text
-from app.agents.pii_detector_runner import detect_pii
+import asyncio
+import json
+import time
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from pydantic import ValidationError
+
+from app.models.pydentic_model import (DataSourceRequest, RedactedTicket, Ticket, Interaction, RedactedInteraction,
+                                       RedactionSummary)
+from app.models.span import Span, to_pii_entities, from_pii_entities
+from app.connectors.connector_registry import fetch_ticket, update_ticket, fetch_tickets, update_tickets
+from app.utils.pii_redactor import redact_text, merge_spans, RedactionStrategy
+from app.agents.pii_detector_runner import detect_pii, detect_pii_batch, DETECTION_VERSION, BATCH_DETECTION_VERSION
+from app.utils.detection_cache import make_cache_key
+from app.utils.ticket_state_store import TicketStateStore, InteractionState
+from app.utils.single_flight import SingleFlight, KeyedLocks
+from app.utils.known_entities import KnownEntities
+from app.utils.token_vault import TokenVault, tokenizer
+from app.utils.interaction_batcher import pack_interactions
+from app.utils.pii_regex_detector import pre_detect_pii, merge_entities, PreDetectionResult
+from app.utils.metrics import (STAGE_DURATION, INTERACTIONS_PROCESSED, INTERACTIONS_SKIPPED,
+                               INTERACTIONS_PARSE_FAILED, INTERACTIONS_WITHOUT_LLM, INTERACTIONS_REUSED,
+                               KNOWN_ENTITY_HITS, Gauge)
+from app.config.settings import (MAX_CONCURRENT_INTERACTIONS, BATCH_DETECTION,
+                                 BATCH_MAX_CHARS, BATCH_MAX_INTERACTIONS, PRE_DETECTION, TICKET_STATE_PATH,
+                                 REDACTION_DEBOUNCE_SECONDS, KNOWN_ENTITY_MIN_LENGTH, TOKEN_VAULT_PATH,
+                                 TOKEN_VAULT_HOT_SIZE)
 
 
 from app.config.logger_config import setup_logger
 logger = setup_logger()
 
+# Processed interactions per ticket, for incremental re-redaction (optional)
+ticket_state_store = TicketStateStore(TICKET_STATE_PATH) if TICKET_STATE_PATH else None
+
+# Reversible tokens for the `tokenize` strategy (optional), see `POST /detokenize`
+token_vault = TokenVault(TOKEN_VAULT_PATH, hot_size=TOKEN_VAULT_HOT_SIZE) if TOKEN_VAULT_PATH else None
+
+# In-flight redactions by (source, ticket_id, strategy), see `redact_ticket_once`
+ticket_flights = SingleFlight(debounce_seconds=REDACTION_DEBOUNCE_SECONDS)
+Gauge("pii_ticket_redactions_in_flight", "Tickets with a redaction run waiting or running.",
+      function=ticket_flights.in_flight)
+
+# Held by (source, ticket_id) from fetch to update, by single runs and batches alike: a run started
+# on an older snapshot of a ticket can never overwrite a newer redaction in the CRM
+ticket_locks = KeyedLocks()
+
+# Stored interaction hashes include the detection setup, changing it makes every interaction look changed
+_STATE_VERSION = (f"{BATCH_DETECTION_VERSION if BATCH_DETECTION else DETECTION_VERSION}"
+                  f":{PRE_DETECTION}:{KNOWN_ENTITY_MIN_LENGTH}")
+
 
 async def redact_ticket(event: DataSourceRequest, redaction_strategy: str) -> RedactedTicket:
+    """
+    Full redaction workflow for a ticket: fetch → detect → redact → update.
+    Returns the redacted ticket once the CRM is updated.
+    """
+    async for item in _redaction_workflow(event, redaction_strategy):
+        if isinstance(item, RedactedTicket):
+            return item
 
-    logger.info("▶️ STARTING TICKET REDACTION WORKFLOW")
 
-    #-------------------------------------------------------
-    # 1. Fetching ticket from CRM
-    #-------------------------------------------------------
-    logger.info(f"1.🔌 Fetching ticket {event.ticket_id} from {event.source}")
-    
-    ticket: Ticket = fetch_ticket(event.source, event.ticket_id)
+async def redact_ticket_once(event: DataSourceRequest, redaction_strategy: str) -> RedactedTicket:
+    """
+    `redact_ticket` coalesced per ticket: concurrent callers share one run (and one CRM update)
+    instead of detecting and writing the same ticket in parallel.
+    """
+    return await ticket_flights.do((event.source, event.ticket_id, redaction_strategy),
+                                   lambda: redact_ticket(event, redaction_strategy))
 
-    logger.debug(f"✅ Ticket found: {ticket}")
-    #-------------------------------------------------------
-    # 2. Detecting & Reducting PII entities for each Interaction in the ticket (LLM Agent)
-    #-------------------------------------------------------
 
-    logger.info("2. 🛠️ Detecting & Reducting PII entities for each Interaction")
+async def redact_ticket_stream(event: DataSourceRequest,
+                               redaction_strategy: str) -> AsyncIterator[Union[RedactedInteraction, RedactionSummary]]:
+    """
+    Same workflow as `redact_ticket`, but yields every redacted interaction as soon as it is ready
+    (in completion order), followed by a summary once the CRM is updated.
 
-    interactions: List[Interaction] = ticket.interactions
-    redacted_interactions: List[RedactedInteraction] = []
+    Interactions redacted again by the ticket's final known-entity pass are yielded a second time,
+    just before the summary: the last record of an interaction is the version sent to the CRM.
+    """
+    total = 0
+    skipped = 0
+    # redacted body sent for each interaction so far
+    streamed: Dict[str, str] = {}
+
+    async for item in _redaction_workflow(event, redaction_strategy):
+        if isinstance(item, RedactedTicket):
+            corrected = [i for i in item.interactions if streamed.get(i.interaction_id) != i.interaction_body]
+            for redacted_interaction in corrected:
+                yield redacted_interaction
+
+            yield RedactionSummary(ticket_id=item.ticket_id,
+                                   total_interactions=total,
+                                   redacted_interactions=total - skipped,
+                                   skipped_interactions=skipped,
+                                   corrected_interactions=len(corrected))
+            return
+
+        total += 1
+        if item is None:
+            skipped += 1
+        else:
+            streamed[item.interaction_id] = item.interaction_body
+            yield item
+
+
+async def redact_ticket_content(ticket: Ticket, redaction_strategy: str, source: str) -> RedactedTicket:
+    """
+    Detect → redact stages only, for tickets which don't come from a CRM connector
+    (e.g. exported dumps, see `app/cli/bulk_redact.py`). `source` only labels the metrics.
+    """
+    results: List[Optional[RedactedInteraction]] = [None] * len(ticket.interactions)
+    known_entities = KnownEntities(min_length=KNOWN_ENTITY_MIN_LENGTH)
+
+    async for index, redacted_interaction in _iter_redacted_interactions(ticket.interactions, redaction_strategy, source,
+                                                                         [known_entities] * len(ticket.interactions)):
+        results[index] = redacted_interaction
+
+    await _apply_known_entities(ticket.interactions, results, range(len(results)), known_entities, redaction_strategy, source)
+
+    if token_vault is not None:
+        await token_vault.flush()
+
+    return RedactedTicket.model_construct(ticket_id=ticket.ticket_id,
+                                          interactions=[r for r in results if r is not None])
+
+
+async def redact_tickets_batch(source: str, ticket_ids: List[str], redaction_strategy: str) -> Dict[str, str]:
+    """
+    Redacts several tickets of one source as a single batch (see `app/services/ingestion_service.py`):
+    one bulk fetch, the interactions of all tickets detected as one pool (and packed together
+    into shared LLM calls with BATCH_DETECTION), one bulk update.
+    Holds the tickets' `ticket_locks` from fetch to update, like single runs do.
+    Returns the error of every ticket which was not redacted, by ticket ID.
+    """
+    logger.info("▶️ STARTING BATCH REDACTION of %s tickets from %s", len(ticket_ids), source)
+
+    started = time.perf_counter()
+
+    # Tickets already being redacted (single runs or another batch) are waited for
+    async with ticket_locks.hold(*((source, ticket_id) for ticket_id in ticket_ids)):
+        # 1. Bulk fetch
+        with STAGE_DURATION.time("fetch", source):
+            tickets: List[Ticket] = await fetch_tickets(source, ticket_ids)
+
+        found = {ticket.ticket_id for ticket in tickets}
+        errors = {ticket_id: f"Ticket ID {ticket_id} not found in {source}."
+                  for ticket_id in ticket_ids if ticket_id not in found}
+
+        # 2. Pooled detection & redaction, every ticket keeping its own known entities
+        runs = [await _start_ticket_run(ticket, redaction_strategy, source) for ticket in tickets]
+        pooled = [(run, index) for run in runs for index in run.to_process]
+
+        logger.info("2. 🛠️ Detecting & Reducting PII entities for %s interactions of %s tickets", len(pooled), len(runs))
+
+        async for j, redacted_interaction in _iter_redacted_interactions(
+                [run.ticket.interactions[index] for run, index in pooled], redaction_strategy, source,
+                [run.known_entities for run, _ in pooled],
+                concurrency=MAX_CONCURRENT_INTERACTIONS * max(len(runs), 1)):
+            run, index = pooled[j]
+            run.results[index] = redacted_interaction
+
+        # New tokens of the whole batch are written at once, before any of them reaches the CRM
+        if token_vault is not None:
+            await token_vault.flush()
+
+        redacted_tickets = [await _finish_ticket_run(run, redaction_strategy, source) for run in runs]
+
+        # 4. Bulk update
+        logger.info("4.🔌 Updating CRM with %s redacted tickets", len(redacted_tickets))
+
+        with STAGE_DURATION.time("update", source):
+            await update_tickets(source, redacted_tickets)
+
+    STAGE_DURATION.observe(time.perf_counter() - started, "batch", source)
+
+    logger.info("⏹️  END OF BATCH REDACTION")
+
+    return errors
 
-    for interaction in interactions:     
+
+async def _redaction_workflow(event: DataSourceRequest,
+                              redaction_strategy: str) -> AsyncIterator[Union[Optional[RedactedInteraction], RedactedTicket]]:
+    """
+    Yields one item per interaction as soon as it is processed (None for skipped ones),
+    then the final RedactedTicket after the CRM has been updated.
+
+    Every interaction is redacted with the ticket's known entities before it is yielded; those
+    re-redacted by the final pass (values confirmed later, see `_apply_known_entities`) are not
+    yielded again: only the final RedactedTicket has their last version.
+    New vault tokens are written once all interactions are redacted, so streamed ones may
+    reach the client before their tokens can be resolved.
+
+    The workflow runs in its own task and never waits for the consumer: a slow streaming client
+    doesn't hold the ticket's lock. The task is cancelled if the consumer stops early.
+    """
+    items: asyncio.Queue = asyncio.Queue()
+
+    async def run() -> None:
         try:
-            # 2a. PII Detection
-            logger.info(f"2a. 🔍 Detecting PII Entities for interaction {interaction.interaction_id}")
-            
-            pii_entities = await detect_pii(interaction.interaction_body)
-            logger.debug(f"✅ PII Entities: {pii_entities} for interaction {interaction.interaction_id}")
-            
-            
-
-            # 2b. PII redaction
-            logger.info(f"2b. ✂️ Redaction PII using {redaction_strategy} strategy")
-
-            redacted_body = redact_text(text=interaction.interaction_body,
-                                        pii_entities=pii_entities,
-                                        strategy=redaction_strategy
-                                        )
-            
-            logger.debug(f"✅ Redacted interaction body: {redacted_body}")
-
-            # 2c. Formulating Redacted Interaction
-            logger.info("2c. 📝 Formulating Redacted Interaction")
-
-            redacted_interaction = RedactedInteraction(interaction_id=interaction.interaction_id,
-                                                        interaction_body=redacted_body,
-                                                        pii_entities=pii_entities
-
-                                                        )
-            logger.debug(f"✅ Redacted interaction: {redacted_interaction}")
-
-            # 2d. Appending list of Redacted Interactions
-            logger.info("2d. 💾 Updating list of Redacted Interactions")
-
-            redacted_interactions.append(redacted_interaction)
-            
-        
+            items.put_nowait(await _run_redaction_workflow(event, redaction_strategy, items.put_nowait))
         except Exception as e:
-                logger.warning(f"⚠️ Skipping interaction {interaction.interaction_id} — LLM output could not be parsed: {e}")
-                logger.info(f"2a. 🛑 No PII found or failed parsing for interaction {interaction.interaction_id}, skipping redaction.")
+            items.put_nowait(e)
+
+    task = asyncio.create_task(run())
+    try:
+        while True:
+            item = await items.get()
+            if isinstance(item, Exception):
+                raise item
+            yield item
+            if isinstance(item, RedactedTicket):
+                return
+    finally:
+        task.cancel()
+
+
+async def _run_redaction_workflow(event: DataSourceRequest,
+                                  redaction_strategy: str,
+                                  emit: Callable[[Optional[RedactedInteraction]], None]) -> RedactedTicket:
+    """Body of `_redaction_workflow`: `emit`s every processed interaction, returns the RedactedTicket sent to the CRM."""
+
+    logger.info("▶️ STARTING TICKET REDACTION WORKFLOW")
+
+    source = event.source
+    started = time.perf_counter()
+
+    async with ticket_locks.hold((source, event.ticket_id)):
+        #-------------------------------------------------------
+        # 1. Fetching ticket from CRM
+        #-------------------------------------------------------
+        logger.info("1.🔌 Fetching ticket %s from %s", event.ticket_id, event.source)
+
+        with STAGE_DURATION.time("fetch", source):
+            ticket: Ticket = await fetch_ticket(event.source, event.ticket_id)
+
+        logger.debug("✅ Ticket found: %s", ticket)
+        #-------------------------------------------------------
+        # 2. Detecting & Reducting PII entities for each Interaction in the ticket (LLM Agent)
+        #-------------------------------------------------------
+
+        logger.info("2. 🛠️ Detecting & Reducting PII entities for each Interaction")
+
+        run = await _start_ticket_run(ticket, redaction_strategy, source)
+
+        for redacted_interaction in run.results:
+            if redacted_interaction is not None:
+                emit(redacted_interaction)
+
+        async for j, redacted_interaction in _iter_redacted_interactions([ticket.interactions[i] for i in run.to_process],
+                                                                         redaction_strategy, source,
+                                                                         [run.known_entities] * len(run.to_process)):
+            index = run.to_process[j]
+            if redacted_interaction is not None:
+                # values confirmed by interactions finished earlier never leave the app in clear text
+                redacted_interaction = await _with_known_entities(ticket.interactions[index], redacted_interaction,
+                                                            run.known_entities, redaction_strategy, source)
+            run.results[index] = redacted_interaction
+            emit(redacted_interaction)
+
+        # New tokens are written once per ticket, before any of them reaches the CRM
+        if token_vault is not None:
+            await token_vault.flush()
+
+        redacted_ticket = await _finish_ticket_run(run, redaction_strategy, source)
+
+        #-------------------------------------------------------
+        # 4. Updating CRM with new redacted ticket
+        #-------------------------------------------------------
+        logger.info("4.🔌 Updating CRM with new redacted ticket")
+
+        with STAGE_DURATION.time("update", source):
+            await update_ticket(event.source, redacted_ticket)
+
+    STAGE_DURATION.observe(time.perf_counter() - started, "ticket", source)
+
+    logger.info("⏹️  END OF REDACTION WORKFLOW")
+
+    return redacted_ticket
+
+
+@dataclass
+class _TicketRun:
+    """Redaction progress of one ticket: interactions still to detect and results so far (original order)."""
+    ticket: Ticket
+    results: List[Optional[RedactedInteraction]]
+    to_process: List[int]
+    # PII confirmed in the ticket so far, matched locally in the interactions detected next
+    known_entities: KnownEntities
+
+
+async def _start_ticket_run(ticket: Ticket, redaction_strategy: str, source: str) -> _TicketRun:
+    """Interactions unchanged since the last run reuse their stored entities, the others are to be detected."""
+    interactions: List[Interaction] = ticket.interactions
+    run = _TicketRun(ticket=ticket,
+                     results=[None] * len(interactions),
+                     to_process=[],
+                     known_entities=KnownEntities(min_length=KNOWN_ENTITY_MIN_LENGTH))
+
+    stored_states = await ticket_state_store.load(source, ticket.ticket_id) if ticket_state_store is not None else {}
+
+    for index, interaction in enumerate(interactions):
+        reused = await _reuse_redacted_interaction(interaction, stored_states.get(interaction.interaction_id), redaction_strategy, source)
+        if reused is None:
+            run.to_process.append(index)
+        else:
+            # a body left as is was already redacted by the last run, its values are gone
+            if reused.interaction_body != interaction.interaction_body:
+                run.known_entities.add(interaction.interaction_body, from_pii_entities(reused.pii_entities))
+            run.results[index] = reused
+
+    if stored_states:
+        logger.info("2. ♻️ Reusing %s unchanged interactions, detecting %s",
+                    len(interactions) - len(run.to_process), len(run.to_process))
+
+    return run
 
-    logger.debug(f"✅ Final list of redacted interactions: {redacted_interactions}")
+
+async def _finish_ticket_run(run: _TicketRun, redaction_strategy: str, source: str) -> RedactedTicket:
+    """Final known-entity pass, state save and the redacted ticket, once all interactions are detected."""
+    interactions = run.ticket.interactions
+
+    # Interactions detected before (or alongside) the one confirming a value get it too
+    await _apply_known_entities(interactions, run.results, run.to_process, run.known_entities, redaction_strategy, source)
+
+    if ticket_state_store is not None:
+        await ticket_state_store.save(source, run.ticket.ticket_id,
+                                [_interaction_state(interactions[i], run.results[i])
+                                 for i in run.to_process if run.results[i] is not None])
+
+    # 2d. Collecting list of Redacted Interactions in the original order, skipped interactions are dropped
+    logger.info("2d. 💾 Updating list of Redacted Interactions")
+
+    redacted_interactions: List[RedactedInteraction] = [r for r in run.results if r is not None]
+
+    logger.debug("✅ Final list of redacted interactions: %s", redacted_interactions)
 
     #-------------------------------------------------------
     # 3. Formulating Redacted Ticket as a final outcome
     #-------------------------------------------------------
     logger.info("3. 📝 Formulating Redacted Ticket")
 
-    redacted_ticket = RedactedTicket(ticket_id=event.ticket_id,
-                                     interactions=redacted_interactions,                                    
+    # built from already validated interactions, no need to validate them again
+    redacted_ticket = RedactedTicket.model_construct(ticket_id=run.ticket.ticket_id,
+                                                     interactions=redacted_interactions,
+                                                    )
+    logger.debug("✅ Redacted ticket: %s", redacted_ticket)
+
+    return redacted_ticket
+
+
+async def _iter_redacted_interactions(interactions: List[Interaction],
+                                      redaction_strategy: str,
+                                      source: str,
+                                      known_entities: Sequence[KnownEntities],
+                                      concurrency: int = MAX_CONCURRENT_INTERACTIONS,
+                                      ) -> AsyncIterator[Tuple[int, Optional[RedactedInteraction]]]:
+    """
+    Processes interactions concurrently (at most `concurrency` at a time, and bounded per process)
+    and yields `(index, redacted interaction or None)` in completion order.
+    Pending work is cancelled if the consumer stops early (e.g. a streaming client disconnects).
+    `known_entities` holds the dictionary of each interaction's ticket (shared by the interactions
+    of a ticket); every redacted interaction adds its entities to it.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    done: asyncio.Queue = asyncio.Queue()
+
+    if BATCH_DETECTION:
+        tasks = [asyncio.create_task(_redact_interactions_batched(interactions, redaction_strategy, source, known_entities,
+                                                                  semaphore, done.put_nowait))]
+    else:
+        async def redact_one(index: int) -> None:
+            done.put_nowait((index, await _redact_interaction(interactions[index], redaction_strategy, source,
+                                                              known_entities[index], semaphore)))
+
+        tasks = [asyncio.create_task(redact_one(index)) for index in range(len(interactions))]
+
+    try:
+        for _ in range(len(interactions)):
+            index, redacted_interaction = await done.get()
+            if redacted_interaction is None:
+                INTERACTIONS_SKIPPED.inc(source)
+            else:
+                INTERACTIONS_PROCESSED.inc(source)
+            yield index, redacted_interaction
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def _redact_interaction(interaction: Interaction,
+                              redaction_strategy: str,
+                              source: str,
+                              known_entities: KnownEntities,
+                              semaphore: asyncio.Semaphore) -> Optional[RedactedInteraction]:
+    """
+    Detects and redacts PII for a single interaction.
+    Returns None if the interaction has to be skipped (LLM failure or unparsable output).
+    """
+    async with semaphore:
+        try:
+            # 2a. PII Detection
+            logger.info("2a. 🔍 Detecting PII Entities for interaction %s", interaction.interaction_id)
+
+            with STAGE_DURATION.time("detect", source):
+                pii_entities = await _detect_interaction_pii(interaction, source, known_entities)
+            logger.debug("✅ PII Entities: %s for interaction %s", pii_entities, interaction.interaction_id)
+
+            redacted_interaction = await _build_redacted_interaction(interaction, pii_entities, redaction_strategy, source)
+            known_entities.add(interaction.interaction_body, pii_entities)
+
+            return redacted_interaction
+
+        except Exception as e:
+                _count_parse_failure(e, source)
+                logger.warning("⚠️ Skipping interaction %s — LLM output could not be parsed: %s", interaction.interaction_id, e)
+                logger.info("2a. 🛑 No PII found or failed parsing for interaction %s, skipping redaction.", interaction.interaction_id)
+                return None
+
+
+async def _redact_interactions_batched(interactions: List[Interaction],
+                                       redaction_strategy: str,
+                                       source: str,
+                                       known_entities: Sequence[KnownEntities],
+                                       semaphore: asyncio.Semaphore,
+                                       emit: Callable[[Tuple[int, Optional[RedactedInteraction]]], None]) -> None:
+    """
+    Detects PII for several short interactions per LLM call (see `pack_interactions`).
+    If a batch fails, its interactions fall back to one-by-one detection.
+    Every processed interaction is reported with `emit((index, redacted interaction or None))`.
+    """
+    bodies = [interaction.interaction_body for interaction in interactions]
+
+    async def emit_redacted(i: int, pii_entities: List[Span]) -> None:
+        try:
+            redacted_interaction = await _build_redacted_interaction(interactions[i], pii_entities, redaction_strategy, source)
+        except Exception as e:
+            _count_parse_failure(e, source)
+            logger.warning("⚠️ Skipping interaction %s — redaction failed: %s", interactions[i].interaction_id, e)
+            emit((i, None))
+            return
+
+        known_entities[i].add(bodies[i], pii_entities)
+        emit((i, redacted_interaction))
+
+    # Interactions resolved by the regex pre-detector never reach the batches
+    pre_detections = [_pre_detect(body, known_entities[i]) for i, body in enumerate(bodies)]
+    to_detect: List[int] = []
+
+    for i, pre_detection in enumerate(pre_detections):
+        if pre_detection.needs_llm:
+            to_detect.append(i)
+        else:
+            logger.info("2a. ⚡ No LLM needed for interaction %s", interactions[i].interaction_id)
+            INTERACTIONS_WITHOUT_LLM.inc(source)
+            await emit_redacted(i, pre_detection.entities)
+
+    batches = [[to_detect[j] for j in batch]
+               for batch in pack_interactions([bodies[i] for i in to_detect],
+                                              max_chars=BATCH_MAX_CHARS,
+                                              max_interactions=BATCH_MAX_INTERACTIONS)]
+
+    logger.info("2a. 📦 Packed %s interactions into %s detection batches", len(to_detect), len(batches))
+
+    async def redact_one(i: int) -> None:
+        emit((i, await _redact_interaction(interactions[i], redaction_strategy, source, known_entities[i], semaphore)))
+
+    async def run_batch(batch: List[int]) -> None:
+        if len(batch) == 1:
+            await redact_one(batch[0])
+            return
+
+        try:
+            async with semaphore:
+                logger.info("2a. 🔍 Detecting PII Entities for a batch of %s interactions", len(batch))
+                with STAGE_DURATION.time("detect", source):
+                    entities_per_interaction = await detect_pii_batch([bodies[i] for i in batch])
+
+        except Exception as e:
+            logger.warning("⚠️ Batch detection failed, falling back to single interactions: %s", e)
+            await asyncio.gather(*(redact_one(i) for i in batch))
+            return
+
+        for i, pii_entities in zip(batch, entities_per_interaction):
+            pii_entities = merge_entities(pii_entities, pre_detections[i].entities)
+            logger.debug("✅ PII Entities: %s for interaction %s", pii_entities, interactions[i].interaction_id)
+            await emit_redacted(i, pii_entities)
+
+    await asyncio.gather(*(run_batch(batch) for batch in batches))
+
+
+async def _detect_interaction_pii(interaction: Interaction,
+                                  source: str,
+                                  known_entities: KnownEntities) -> List[Span]:
+    """
+    Runs the regex pre-detector first (with the ticket's known entities) and calls the LLM
+    only if the interaction may contain other PII which the regexes can't find (names, addresses, ...).
+    """
+    pre_detection = _pre_detect(interaction.interaction_body, known_entities)
+
+    if not pre_detection.needs_llm:
+        logger.info("2a. ⚡ No LLM needed for interaction %s", interaction.interaction_id)
+        INTERACTIONS_WITHOUT_LLM.inc(source)
+        return pre_detection.entities
+
+    llm_entities = await detect_pii(interaction.interaction_body)
+
+    return merge_entities(llm_entities, pre_detection.entities)
+
+
+async def _reuse_redacted_interaction(interaction: Interaction,
+                                stored_state: Optional[InteractionState],
+                                redaction_strategy: str,
+                                source: str) -> Optional[RedactedInteraction]:
+    """
+    Redacted interaction rebuilt from the last run's state, or None if the interaction is new or was edited.
+    The CRM may return either the original body, which is redacted again with the stored entities,
+    or the body redacted by the last run, which is kept as is.
+    """
+    if stored_state is None:
+        return None
+
+    content_hash = make_cache_key(interaction.interaction_body, _STATE_VERSION)
+    pii_entities = [Span(**e) for e in stored_state.entities]
+
+    if content_hash == stored_state.redacted_hash:
+        redacted_interaction = RedactedInteraction.model_construct(interaction_id=interaction.interaction_id,
+                                                                   interaction_body=interaction.interaction_body,
+                                                                   pii_entities=to_pii_entities(pii_entities))
+    elif content_hash == stored_state.content_hash:
+        redacted_interaction = await _build_redacted_interaction(interaction, pii_entities, redaction_strategy, source)
+    else:
+        return None
+
+    INTERACTIONS_REUSED.inc(source)
+    return redacted_interaction
+
+
+def _interaction_state(interaction: Interaction, redacted_interaction: RedactedInteraction) -> InteractionState:
+    return InteractionState(interaction_id=interaction.interaction_id,
+                            content_hash=make_cache_key(interaction.interaction_body, _STATE_VERSION),
+                            redacted_hash=make_cache_key(redacted_interaction.interaction_body, _STATE_VERSION),
+                            entities=[e._asdict() for e in from_pii_entities(redacted_interaction.pii_entities)])
+
+
+def _count_parse_failure(error: Exception, source: str) -> None:
+    # Malformed LLM output surfaces as a JSON error or as entities not matching the schema
+    if isinstance(error, (json.JSONDecodeError, ValidationError, KeyError, TypeError)):
+        INTERACTIONS_PARSE_FAILED.inc(source)
+
+
+def _pre_detect(text: str, known_entities: KnownEntities) -> PreDetectionResult:
+    """Known entities of the ticket found in `text`; with PRE_DETECTION, also decides whether the LLM is needed."""
+    known = known_entities.find(text)
+
+    if not PRE_DETECTION:
+        return PreDetectionResult(entities=known, needs_llm=True)
+
+    return pre_detect_pii(text, known)
+
+
+async def _apply_known_entities(interactions: List[Interaction],
+                          results: List[Optional[RedactedInteraction]],
+                          indexes: Iterable[int],
+                          known_entities: KnownEntities,
+                          redaction_strategy: str,
+                          source: str) -> None:
+    """
+    Final pass once every interaction is detected: redacts again the interactions (among `indexes`)
+    containing known entities their own detection missed, e.g. a name the LLM only recognized
+    in a later message, or one confirmed by an interaction detected concurrently.
+    """
+    for i in indexes:
+        if results[i] is not None:
+            results[i] = await _with_known_entities(interactions[i], results[i], known_entities, redaction_strategy, source)
+
+
+async def _with_known_entities(interaction: Interaction,
+                         redacted_interaction: RedactedInteraction,
+                         known_entities: KnownEntities,
+                         redaction_strategy: str,
+                         source: str) -> RedactedInteraction:
+    """`redacted_interaction`, redacted again if it misses known entities (returned as is otherwise)."""
+    hits = known_entities.find(interaction.interaction_body)
+    detected = from_pii_entities(redacted_interaction.pii_entities)
+    pii_entities = merge_entities(detected, hits)
+    missed = len(pii_entities) - len(detected)
+    if not missed:
+        return redacted_interaction
+
+    logger.info("2d. 🔁 Redacting %s known entities missed in interaction %s", missed, interaction.interaction_id)
+    KNOWN_ENTITY_HITS.inc(source, amount=missed)
+    return await _build_redacted_interaction(interaction, pii_entities, redaction_strategy, source)
+
+
+async def _build_redacted_interaction(interaction: Interaction,
+                                pii_entities: List[Span],
+                                redaction_strategy: str,
+                                source: str) -> RedactedInteraction:
+
+    # 2b. PII redaction
+    logger.info("2b. ✂️ Redaction PII using %s strategy", redaction_strategy)
+
+    strategy: Union[str, RedactionStrategy] = redaction_strategy
+    if token_vault is not None and redaction_strategy == "tokenize":
+        # vault lookups run in its own thread; `redact_text` then takes every token from the result
+        body = interaction.interaction_body
+        strategy = tokenizer(await token_vault.prepare((label, body[start:end])
+                                                       for start, end, label in merge_spans(pii_entities, len(body))))
+
+    with STAGE_DURATION.time("redact", source):
+        redacted_body = redact_text(text=interaction.interaction_body,
+                                    pii_entities=pii_entities,
+                                    strategy=strategy
                                     )
-    logger.debug(f"✅ Redacted ticket: {redacted_ticket}")
 
-    #-------------------------------------------------------
-    # 4. Updating CRM with new redacted ticket
-    #-------------------------------------------------------
-    logger.info("4.🔌 Updating CRM with new redacted ticket")
+    logger.debug("✅ Redacted interaction body: %s", redacted_body)
 
-    update_ticket(event.source, redacted_ticket)
+    # 2c. Formulating Redacted Interaction
+    logger.info("2c. 📝 Formulating Redacted Interaction")
 
+    # the interaction comes from a validated ticket and the spans from a validated LLM answer
+    redacted_interaction = RedactedInteraction.model_construct(interaction_id=interaction.interaction_id,
+                                                               interaction_body=redacted_body,
+                                                               pii_entities=to_pii_entities(pii_entities)
+                                                               )
+    logger.debug("✅ Redacted interaction: %s", redacted_interaction)
 
-    logger.info("⏹️  END OF REDACTION WORKFLOW")
-    
-    return redacted_ticket
+    return redacted_interaction
@@ -0,0 +1,109 @@
+import hashlib
+import json
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from app.utils.sqlite_store import SqliteThread, connect_sqlite
+
+
+def make_cache_key(text: str, version: str) -> str:
+    """
+    Content-addressed cache key: sha256 of the detection version and the interaction body.
+    """
+    return hashlib.sha256(f"{version}\0{text}".encode("utf-8")).hexdigest()
+
+
+def make_detection_version(prompt: str, model: str) -> str:
+    """
+    Short fingerprint of the prompt and the model: changing any of them invalidates cached results.
+    """
+    return hashlib.sha256(f"{model}\0{prompt}".encode("utf-8")).hexdigest()[:16]
+
+
+class DetectionCache:
+    """
+    Cache of detection results (list of {"start", "end", "label"} dicts) keyed by `make_cache_key`.
+
+    - In memory: bounded LRU, entries expire after `ttl_seconds`.
+    - On disk (optional): SQLite file at `path`, survives restarts and can be shared
+      between several uvicorn workers on the same host. Memory is checked first,
+      disk hits are promoted to memory. Disk queries run in the cache's own thread.
+    """
+
+    # Expired rows are purged from the SQLite file once per this many writes
+    _PURGE_EVERY = 1000
+
+    def __init__(self, max_entries: int, ttl_seconds: float, path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+
+        self._entries: "OrderedDict[str, tuple[float, List[Dict]]]" = OrderedDict()
+        self._writes = 0
+        self._db: Optional[sqlite3.Connection] = None
+        self._thread = SqliteThread("detection-cache")
+
+        if path:
+            self._db = connect_sqlite(path)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS detection_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+
+    async def get(self, key: str) -> Optional[List[Dict]]:
+        now = time.time()
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+
+        if self._db is not None:
+            row = await self._thread.run(self._select, key)
+            if row is not None and row[1] > now:
+                value = json.loads(row[0])
+                self._remember(key, row[1], value)
+                self.hits += 1
+                return value
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: List[Dict]) -> None:
+        expires_at = time.time() + self.ttl_seconds
+        self._remember(key, expires_at, value)
+
+        if self._db is not None:
+            self._writes += 1
+            purge = self._writes % self._PURGE_EVERY == 0
+            await self._thread.run(self._insert, key, json.dumps(value), expires_at, purge)
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+    async def clear(self) -> None:
+        self._entries.clear()
+        if self._db is not None:
+            await self._thread.run(self._db.execute, "DELETE FROM detection_cache")
+
+    def _select(self, key: str) -> Optional[Tuple[str, float]]:
+        return self._db.execute("SELECT value, expires_at FROM detection_cache WHERE key = ?", (key,)).fetchone()
+
+    def _insert(self, key: str, value: str, expires_at: float, purge: bool) -> None:
+        self._db.execute("INSERT OR REPLACE INTO detection_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                         (key, value, expires_at))
+        if purge:
+            self._db.execute("DELETE FROM detection_cache WHERE expires_at <= ?", (time.time(),))
+
+    def _remember(self, key: str, expires_at: float, value: List[Dict]) -> None:
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
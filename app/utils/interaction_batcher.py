@@ -0,0 +1,45 @@
+from typing import List
+
+
+def pack_interactions(ticket_bodies: List[str], max_chars: int, max_interactions: int) -> List[List[int]]:
+    """
+    Groups interaction bodies into batches for multi-interaction detection.
+
+    Interactions are packed greedily, in their original order, until the batch
+    reaches `max_chars` characters or `max_interactions` items.
+    A body longer than `max_chars` always ends up alone in its own batch.
+
+    Returns a list of batches, each batch is a list of indexes into `ticket_bodies`.
+    """
+    batches: List[List[int]] = []
+    current: List[int] = []
+    current_chars = 0
+
+    for index, body in enumerate(ticket_bodies):
+        size = len(body)
+
+        if current and (current_chars + size > max_chars or len(current) >= max_interactions):
+            batches.append(current)
+            current, current_chars = [], 0
+
+        current.append(index)
+        current_chars += size
+
+    if current:
+        batches.append(current)
+
+    return batches
+
+
+def build_batch_message(ticket_bodies: List[str]) -> str:
+    """
+    Wraps every interaction body into numbered delimiters, e.g.:
+
+    <<<INTERACTION 0>>>
+    Hi, I'm Laura Jenkins.
+    <<<END INTERACTION 0>>>
+    """
+    return "\n".join(
+        f"<<<INTERACTION {index}>>>\n{body}\n<<<END INTERACTION {index}>>>"
+        for index, body in enumerate(ticket_bodies)
+    )
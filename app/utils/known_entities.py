@@ -0,0 +1,52 @@
+from typing import Dict, List, Tuple
+
+from app.models.span import Span
+from app.utils.pii_spans_locator import find_pii_spans
+
+
+class KnownEntities:
+    """
+    PII values already confirmed in the interactions of one ticket, so they can be
+    found again in the ticket's other interactions without asking the LLM.
+
+    - Values shorter than `min_length` characters are not kept (too ambiguous, e.g. "Al");
+      `min_length=0` disables the dictionary.
+    - Matching ignores case and whitespace runs ("JOHN  SMITH" ~ "John Smith"),
+      but never inside a word ("Johnson" does not match "John").
+    """
+
+    def __init__(self, min_length: int = 4):
+        self.min_length = min_length
+        # (value, label) → None: an insertion-ordered set, earlier values win ties
+        self._values: Dict[Tuple[str, str], None] = {}
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def add(self, text: str, entities: List[Span]) -> None:
+        """Keeps the values of the `entities` detected in `text`."""
+        if not self.min_length:
+            return
+
+        for e in entities:
+            value = text[e.start:e.end].strip()
+            if len(value) >= self.min_length:
+                self._values.setdefault((value, e.label), None)
+
+    def find(self, text: str) -> List[Span]:
+        """Every occurrence of a known value in `text`, in a single pass."""
+        if not self._values:
+            return []
+
+        matches = find_pii_spans(text,
+                                 [{"text": value, "label": label} for value, label in self._values],
+                                 ignore_case=True,
+                                 ignore_whitespace=True)
+
+        return [e for e in matches if _on_word_boundaries(text, e)]
+
+
+def _on_word_boundaries(text: str, entity: Span) -> bool:
+    starts_inside_word = entity.start > 0 and text[entity.start - 1].isalnum() and text[entity.start].isalnum()
+    ends_inside_word = entity.end < len(text) and text[entity.end - 1].isalnum() and text[entity.end].isalnum()
+    return not (starts_inside_word or ends_inside_word)
@@ -0,0 +1,201 @@
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from app.utils.runtime_stats import current_rss_bytes
+
+# Minimal Prometheus client: counters, gauges and histograms with labels,
+# rendered in the Prometheus text exposition format (version 0.0.4).
+# Updates are plain dict operations on the event loop thread, no locks needed.
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_REGISTRY: List["_Metric"] = []
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        _REGISTRY.append(self)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def _labels(self, values: Tuple[str, ...], extra: str = "") -> str:
+        pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, values)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 function: Optional[Callable[[], float]] = None):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._function = function
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def _samples(self) -> List[str]:
+        if self._function is not None:
+            return [f"{self.name} {self._function()}"]
+        return [f"{self.name}{self._labels(labels)} {value}" for labels, value in self._values.items()]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 function: Optional[Callable[[], float]] = None):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._function = function
+
+    def set(self, value: float, *labels: str) -> None:
+        self._values[labels] = value
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def _samples(self) -> List[str]:
+        if self._function is not None:
+            return [f"{self.name} {self._function()}"]
+        return [f"{self.name}{self._labels(labels)} {value}" for labels, value in self._values.items()]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # per label set: [count per bucket..., count above the last bucket], sum
+        self._counts: Dict[Tuple[str, ...], List[int]] = {}
+        self._sums: Dict[Tuple[str, ...], float] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        counts = self._counts.get(labels)
+        if counts is None:
+            counts = self._counts[labels] = [0] * (len(self.buckets) + 1)
+            self._sums[labels] = 0.0
+        counts[bisect_left(self.buckets, value)] += 1
+        self._sums[labels] += value
+
+    @contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *labels)
+
+    def _samples(self) -> List[str]:
+        lines = []
+        for labels, counts in self._counts.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                le = self._labels(labels, 'le="%s"' % bound)
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            cumulative += counts[-1]
+            le = self._labels(labels, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{le} {cumulative}")
+            lines.append(f"{self.name}_sum{self._labels(labels)} {self._sums[labels]}")
+            lines.append(f"{self.name}_count{self._labels(labels)} {cumulative}")
+        return lines
+
+
+def render_metrics() -> str:
+    lines: List[str] = []
+    for metric in _REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# ---------------------------------------------------------
+# Redaction pipeline metrics
+# ---------------------------------------------------------
+
+STAGE_DURATION = Histogram(
+    "pii_redaction_stage_duration_seconds",
+    "Duration of the redaction pipeline stages (fetch, detect, redact, update, ticket, batch).",
+    labelnames=("stage", "source"),
+)
+
+INTERACTIONS_PROCESSED = Counter(
+    "pii_interactions_processed_total",
+    "Interactions redacted and returned.",
+    labelnames=("source",),
+)
+
+INTERACTIONS_SKIPPED = Counter(
+    "pii_interactions_skipped_total",
+    "Interactions dropped from the output because detection or redaction failed.",
+    labelnames=("source",),
+)
+
+INTERACTIONS_PARSE_FAILED = Counter(
+    "pii_interactions_parse_failed_total",
+    "Interactions skipped because the LLM output could not be parsed (subset of skipped).",
+    labelnames=("source",),
+)
+
+INTERACTIONS_REUSED = Counter(
+    "pii_interactions_reused_total",
+    "Interactions unchanged since the last run, rebuilt from the ticket state store without detection.",
+    labelnames=("source",),
+)
+
+INTERACTIONS_WITHOUT_LLM = Counter(
+    "pii_interactions_without_llm_total",
+    "Interactions resolved by the regex pre-detector without any LLM call.",
+    labelnames=("source",),
+)
+
+KNOWN_ENTITY_HITS = Counter(
+    "pii_known_entity_hits_total",
+    "Spans added by the final known-entity pass of a ticket, missed by the detection of their interaction.",
+    labelnames=("source",),
+)
+
+WEBHOOK_EVENTS = Counter(
+    "pii_webhook_events_total",
+    "Ticket events accepted by the webhook endpoint.",
+    labelnames=("source",),
+)
+
+WEBHOOK_TICKETS_FAILED = Counter(
+    "pii_webhook_tickets_failed_total",
+    "Tickets of webhook batches which could not be redacted (not found, fetch, detection or update failures).",
+    labelnames=("source",),
+)
+
+PROCESS_RSS = Gauge(
+    "process_resident_memory_bytes",
+    "Resident memory size in bytes.",
+    function=current_rss_bytes,
+)
@@ -1,43 +1,105 @@
 # redaction_utils.py
 import hashlib
-from typing import List
-from app.models.pydentic_model import PIIEntity
+from typing import Callable, Dict, Iterator, List, Tuple, Union
+from app.models.span import Span
+
+# A strategy gets the original span text and its label and returns the replacement
+RedactionStrategy = Callable[[str, str], str]
+
+
+def _mask(span: str, label: str) -> str:
+    return "*" * len(span)
+
+
+def _tokenize(span: str, label: str) -> str:
+    return f"{{{{{label}:{hashlib.sha1(span.encode('utf-8')).hexdigest()[:8]}}}}}"
+
+
+def _hash(span: str, label: str) -> str:
+    return f"{{{{{label}:{hashlib.sha256(span.encode('utf-8')).hexdigest()}}}}}"
+
+
+def _label(span: str, label: str) -> str:
+    return f"[PII::{label}]"
+
+
+_STRATEGIES: Dict[str, RedactionStrategy] = {
+    "mask": _mask,
+    "tokenize": _tokenize,
+    "hash": _hash,
+    "label": _label,
+}
+
+
+def register_strategy(name: str, strategy: RedactionStrategy) -> None:
+    """
+    Registers a custom redaction strategy under `name`, so it can be used as `REDACTION_STRATEGY`.
+    """
+    _STRATEGIES[name] = strategy
+
+
+def get_strategy(strategy: Union[str, RedactionStrategy]) -> RedactionStrategy:
+    if callable(strategy):
+        return strategy
+    try:
+        return _STRATEGIES[strategy]
+    except KeyError:
+        raise ValueError(f"Unknown strategy: {strategy}") from None
+
 
 def redact_text(
     text: str,
-    pii_entities: List[PIIEntity],
-    strategy: str = "mask" # default
+    pii_entities: List[Span],
+    strategy: Union[str, RedactionStrategy] = "mask" # default
 ) -> str:
     """
     Redacts each exact match of `text` from the list of PII entities using the given strategy:
     - mask:     replace each character with '*'
     - tokenize: replace with {{LABEL:deterministic-token}}
     - hash:     replace with {{LABEL:sha256-hex}}
+    - label:    replace with [PII::LABEL]
+    or any strategy added with `register_strategy` (a callable can be passed as well).
+
+    Overlapping spans, and adjacent spans with the same label, are merged first.
+    The output is built in a single pass, linear in the text length and number of spans.
+    """
+    return "".join(iter_redacted_chunks(text, pii_entities, get_strategy(strategy)))
+
+
+def iter_redacted_chunks(text: str, pii_entities: List[Span], replace: RedactionStrategy) -> Iterator[str]:
     """
+    Yields the redacted text piece by piece: untouched text and replacements in order.
+    """
+    position = 0
+
+    for start, end, label in merge_spans(pii_entities, len(text)):
+        yield text[position:start]
+        yield replace(text[start:end], label)
+        position = end
+
+    yield text[position:]
+
+
+def merge_spans(pii_entities: List[Span], text_length: int) -> List[Tuple[int, int, str]]:
+    """
+    Sorts the spans and merges overlapping ones (and adjacent ones with the same label).
+    A merged span keeps the label of its first (leftmost, then longest) part.
+    Spans are clipped to the text; empty spans are dropped.
+    """
+    merged: List[Tuple[int, int, str]] = []
+
+    for e in sorted(pii_entities, key=lambda e: (e.start, -e.end)):
+        start, end = max(e.start, 0), min(e.end, text_length)
+        if start >= end:
+            continue
+
+        if merged:
+            last_start, last_end, last_label = merged[-1]
+            if start < last_end or (start == last_end and e.label == last_label):
+                if end > last_end:
+                    merged[-1] = (last_start, end, last_label)
+                continue
 
+        merged.append((start, end, e.label))
 
-    def make_token(span: str):
-        return hashlib.sha1(span.encode('utf-8')).hexdigest()[:8]
-    
-    redacted_text = text
-
-    # Sort descending by start so indexes don’t shift
-    for e in sorted(pii_entities, key=lambda e: e.start, reverse=True):
-        span = redacted_text[e.start : e.end]
-        # print(f"Redacting span: '{span}' at [{e.start}:{e.end}] with strategy='{strategy}'")
-        if strategy == "mask":
-            replacement = "*" * len(span)
-        elif strategy == "tokenize":
-            token = make_token(span)
-            replacement = f"{{{{{e.label}:{token}}}}}"
-        elif strategy == "hash":
-            digest = hashlib.sha256(span.encode('utf-8')).hexdigest()
-            replacement = f"{{{{{e.label}:{digest}}}}}"
-        else:
-            raise ValueError(f"Unknown strategy: {strategy}")
-        redacted_text = (
-            redacted_text[: e.start] + replacement + redacted_text[e.end :]
-        )
-    
-    
-    return redacted_text
+    return merged
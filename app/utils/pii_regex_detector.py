@@ -0,0 +1,173 @@
+import re
+from dataclasses import dataclass
+from typing import List, Sequence
+
+from app.models.span import Span
+
+# ---------------------------------------------------------
+# Structured PII: found deterministically in a single pass
+# ---------------------------------------------------------
+# Order matters: at the same position the first alternative wins
+# (e.g. an SSN or a card number must not be taken for a phone number).
+
+_STRUCTURED_PII = re.compile(
+    r"(?P<email>[A-Za-z0-9._%+-]+@[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,})"
+    r"|(?P<ip_address>\b(?:25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)(?:\.(?:25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)){3}\b)"
+    r"|(?P<social_security_number>\b\d{3}-\d{2}-\d{4}\b)"
+    r"|(?P<credit_card_number>\b\d(?:[ -]?\d){12,18}\b)"
+    r"|(?P<phone_number>\+\d{1,3}(?:[\s.-]?\d{1,4}){2,5}\b|(?:\(\d{3}\)|\b\d{3})[\s.-]?\d{3}[\s.-]?\d{4}\b)"
+)
+
+# ---------------------------------------------------------
+# Cues of PII which only the LLM can find reliably
+# ---------------------------------------------------------
+# Any match means the interaction has to go to the LLM.
+
+_LLM_CUES = re.compile(
+    # house number followed by a street: possibly an address
+    r"\b\d+\w*\s+(?:\w+\s+){0,3}?(?i:street|st|avenue|ave|road|rd|boulevard|blvd|lane|ln|drive|dr|court|ct|way|place|pl|square|sq|apt|suite)\b"
+    # words which usually introduce personal data
+    r"|(?i:\b(?:name|address|born|birth|dob|passport|licen[cs]e|account|iban|zip|postcode)\b)"
+    # dates: possibly a date of birth
+    r"|\b\d{1,2}[/.-]\d{1,2}[/.-]\d{2,4}\b|\b\d{4}-\d{2}-\d{2}\b"
+    r"|(?i:\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s+\d{1,2}(?:st|nd|rd|th)?,?\s+\d{4}\b)"
+    # long digit runs or groups not recognized above: possibly a phone, account or ID number
+    r"|\d(?:[\s().-]?\d){6,}"
+)
+
+# ---------------------------------------------------------
+# Proper-noun shapes
+# ---------------------------------------------------------
+# Any word with an uppercase letter (any script, e.g. "José", "SMITH", "McKay") may be
+# a name or a place, except the common words below: at the start of a sentence any of
+# `_COMMON_WORDS`, anywhere `_CAPITALIZED_WORDS`. Lowercase words are never names here.
+
+_TOKENS = re.compile(r"(?P<word>[^\W\d_]+(?:['’][^\W\d_]+)*)|(?P<stop>[.!?:;\n])")
+
+# Words always written with capitals which are not PII
+_CAPITALIZED_WORDS = frozenset("""
+    i i'm i'd i'll i've ok
+    monday tuesday wednesday thursday friday saturday sunday
+    january february march april may june july august september october november december
+    id pdf csv hr it faq api url sms vpn ssn ip
+""".split())
+
+# Sentence starters of support tickets
+_COMMON_WORDS = _CAPITALIZED_WORDS | frozenset("""
+    a an the this that these those there here it it's its
+    we we're we've we'll you you're you've your they they're their he she his her my our me us
+    and but so or if when once as after before then also still just now
+    for in on at to from with by of about via within
+    not no yes sure okay sorry unfortunately please thanks thank hi hello hey dear good morning afternoon evening
+    all any some each every other another
+    can could would will should must do does did done is are was were be been has have had
+    what which who how why where let
+    today tomorrow yesterday next last new great kind regards best cheers welcome
+    noted understood confirmed received requested resolved closed opened updated sent attached submitted
+    forwarded processed scheduled booked created delivered shipped cancelled canceled refunded returned
+    rescheduled reset approved rejected escalated assigned pending completed failed blocked
+    refund return reschedule order orders ticket issue issues request payment invoice delivery shipping
+    password email phone call callback customer user client team support agent documents document data
+    file files resolution complaint consultation follow initial escalation status update reminder note
+    problem error login system service product item package warehouse
+""".split())
+
+# "I’m" is looked up as "i'm"
+_APOSTROPHES = str.maketrans("’", "'")
+
+
+@dataclass
+class PreDetectionResult:
+    entities: List[Span]
+    needs_llm: bool
+
+
+def pre_detect_pii(text: str, known: Sequence[Span] = ()) -> PreDetectionResult:
+    """
+    Deterministic PII pre-detector, runs before the LLM.
+
+    - Finds structured PII (email, phone number, SSN, IP address, card number)
+      with one compiled pattern, in a single pass over the text.
+    - Adds the `known` entities (PII already confirmed elsewhere, e.g. earlier in the ticket)
+      which don't overlap the structured ones.
+    - Decides whether the interaction still needs the LLM: the text (with all these
+      entities blanked out) is sent if it has a proper-noun shape (see `_COMMON_WORDS`)
+      or a cue of an address, a date or an ID.
+
+    Interactions without any such candidate (e.g. "Reschedule confirmed for Thursday.",
+    "My email is jane@mail.com") get `needs_llm=False`.
+    """
+    entities: List[Span] = []
+    needs_llm = False
+    blanked = text
+
+    for match in _STRUCTURED_PII.finditer(text):
+        label = match.lastgroup
+
+        # card-like digit runs failing the checksum may still be account numbers
+        if label == "credit_card_number" and not _luhn_valid(match.group()):
+            needs_llm = True
+            continue
+
+        entities.append(Span(match.start(), match.end(), label))
+
+    if known:
+        entities = merge_entities(entities, list(known))
+
+    if entities:
+        parts = []
+        position = 0
+        for e in entities:
+            parts.append(text[position:e.start])
+            parts.append(" " * (e.end - e.start))
+            position = e.end
+        parts.append(text[position:])
+        blanked = "".join(parts)
+
+    if not needs_llm:
+        needs_llm = _LLM_CUES.search(blanked) is not None or _has_proper_noun(blanked)
+
+    return PreDetectionResult(entities=entities, needs_llm=needs_llm)
+
+
+def merge_entities(primary: List[Span], secondary: List[Span]) -> List[Span]:
+    """
+    Adds `secondary` entities which do not overlap any of the `primary` ones.
+    Result is sorted by start position.
+    """
+    merged = list(primary)
+    for e in secondary:
+        if all(e.end <= p.start or e.start >= p.end for p in primary):
+            merged.append(e)
+
+    return sorted(merged, key=lambda e: (e.start, e.end))
+
+
+def _has_proper_noun(text: str) -> bool:
+    sentence_start = True
+    for match in _TOKENS.finditer(text):
+        word = match.group("word")
+        if word is None:
+            sentence_start = True
+            continue
+
+        if not word.islower():
+            common = _COMMON_WORDS if sentence_start else _CAPITALIZED_WORDS
+            if word.lower().translate(_APOSTROPHES) not in common:
+                return True
+        sentence_start = False
+
+    return False
+
+
+def _luhn_valid(number: str) -> bool:
+    digits = [int(c) for c in number if c.isdigit()]
+    checksum = 0
+    for i, digit in enumerate(reversed(digits)):
+        if i % 2 == 1:
+            digit *= 2
+            if digit > 9:
+                digit -= 9
+        checksum += digit
+
+    return checksum % 10 == 0
@@ -1,10 +1,8 @@
-import re
-   
-from app.models.pydentic_model import PIIEntity
-from typing import List, Dict
+from app.models.span import Span
+from typing import Iterable, List, Dict, Tuple
 
 
-def locate_pii_spans(text: str, spans: List[Dict[str, str]]) -> List[PIIEntity]:
+def locate_pii_spans(text: str, spans: List[Dict[str, str]]) -> List[Dict]:
     """
     Finds and returns the start and end character positions of each PII span in the original text.
 
@@ -44,29 +42,111 @@ def locate_pii_spans(text: str, spans: List[Dict[str, str]]) -> List[PIIEntity]:
     ]
 
     --- NOTES ---
-    - Assumes each span appears **exactly once** in the text.
+    - Every occurrence of a span in the text is returned.
     - Spans must match exactly — casing and spacing are important.
-    - If a span is not found, the function may raise an error or skip it.
+    - Overlapping matches are resolved: the leftmost, then the longest match wins.
+    - If a span is not found, it is skipped.
 
     """
-    entities: List[PIIEntity] = []
+    # the ADK tool contract: plain dicts, as described to the model; the app itself uses `find_pii_spans`
+    return [{"start": start, "end": end, "label": label} for start, end, label in find_pii_spans(text, spans)]
+
+
+def find_pii_spans(text: str,
+                   spans: List[Dict[str, str]],
+                   *,
+                   ignore_case: bool = False,
+                   ignore_whitespace: bool = False) -> List[Span]:
+    """
+    Locates all span snippets in `text`: one `str.find` scan per distinct snippet, then one sweep
+    over the sorted matches.
+
+    - Repeated snippets are searched only once, with the label of the span listed first.
+    - Overlapping or nested matches are resolved deterministically: the leftmost match wins,
+      then the longest one, then the span listed first in `spans`.
+    - `ignore_case`: "JOHN SMITH" matches the "John Smith" span.
+    - `ignore_whitespace`: any run of whitespace matches any other run ("John  Smith" ~ "John\nSmith").
+
+    Returned offsets always refer to the original `text`, entities are sorted by start position.
+    """
+    # snippet → label, in order of `spans`
+    labels: Dict[str, str] = {}
 
     for span in spans:
-        label = span["label"]
-        snippet = span["text"]
-
-        if not snippet:
-            continue
-
-        # Escape special regex characters in snippet
-        pattern = re.escape(snippet)
-        for match in re.finditer(pattern, text):
-            entities.append(PIIEntity(
-                start=match.start(),
-                end=match.end(),
-                label=label
-            ))
-    # print("Check of the function outcome - just for testing:")
-    # print(entities)        
-
-    return entities
+        snippet = _normalize(span["text"], ignore_case, ignore_whitespace)[0]
+        if ignore_whitespace:
+            snippet = snippet.strip()
+
+        if snippet:
+            labels.setdefault(snippet, span["label"])
+
+    if not labels:
+        return []
+
+    if not ignore_case and not ignore_whitespace:
+        return [Span(start, end, labels[snippet]) for start, end, snippet in _find_snippets(text, labels)]
+
+    haystack, offsets = _normalize(text, ignore_case, ignore_whitespace)
+
+    return [Span(offsets[start], offsets[end - 1] + 1, labels[snippet])
+            for start, end, snippet in _find_snippets(haystack, labels)]
+
+
+def _find_snippets(text: str, snippets: Iterable[str]) -> List[Tuple[int, int, str]]:
+    """
+    Leftmost-longest, non-overlapping occurrences of distinct `snippets` as `(start, end, snippet)`.
+    `str.find` is a fast literal search in C: one scan per snippet beats a compiled alternation
+    of all of them, which tries the alternatives one by one at every position.
+    """
+    matches: List[Tuple[int, int, str]] = []
+    find = text.find
+
+    for snippet in snippets:
+        length = len(snippet)
+        start = find(snippet)
+        while start >= 0:
+            matches.append((start, -length, snippet))
+            start = find(snippet, start + 1)
+
+    # leftmost first, then longest (distinct snippets of the same length can't match at the same start)
+    matches.sort()
+
+    located: List[Tuple[int, int, str]] = []
+    end = 0
+    for start, negative_length, snippet in matches:
+        if start >= end:
+            end = start - negative_length
+            located.append((start, end, snippet))
+
+    return located
+
+
+def _normalize(text: str, ignore_case: bool, ignore_whitespace: bool) -> Tuple[str, List[int]]:
+    """
+    Returns the normalized text and, for each of its characters, the index in the original text
+    (no offsets when nothing is normalized: they are the identity).
+    Case folding is done per character so that every normalized character maps to one original character.
+    """
+    if not ignore_case and not ignore_whitespace:
+        return text, []
+
+    chars: List[str] = []
+    offsets: List[int] = []
+    previous_space = False
+
+    for index, char in enumerate(text):
+        if ignore_whitespace and char.isspace():
+            if previous_space:
+                continue
+            char = " "
+            previous_space = True
+        else:
+            previous_space = False
+            if ignore_case:
+                lowered = char.lower()
+                char = lowered if len(lowered) == 1 else char
+
+        chars.append(char)
+        offsets.append(index)
+
+    return "".join(chars), offsets
@@ -0,0 +1,17 @@
+import os
+import resource
+import sys
+
+
+def current_rss_bytes() -> int:
+    """
+    Resident memory of the current process.
+    Reads /proc on Linux; elsewhere falls back to the peak RSS reported by getrusage.
+    """
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+        return peak if sys.platform == "darwin" else peak * 1024
@@ -0,0 +1,98 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Dict, Hashable, List, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls sharing a key into a single run, whose result
+    (or exception) is returned to every caller.
+
+    - A call arriving while a run for its key is waiting to start joins it.
+    - A call arriving once the run has started may need newer data than the run
+      has read, so it queues one follow-up run, shared by all such late callers.
+    - With `debounce_seconds`, a run waits that long before starting, so a burst
+      of calls collapses into a single run.
+
+    Runs are shielded: a caller giving up (e.g. a client disconnecting) never
+    cancels a run other callers are waiting for.
+    """
+
+    def __init__(self, debounce_seconds: float = 0.0):
+        self.debounce_seconds = debounce_seconds
+        self._waiting: Dict[Hashable, asyncio.Task] = {}
+        self._running: Dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        task = self._waiting.get(key)
+
+        if task is None:
+            task = asyncio.ensure_future(self._run(key, call, self._running.get(key)))
+            # the exception is retrieved even if every caller gave up
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._waiting[key] = task
+
+        return await asyncio.shield(task)
+
+    def in_flight(self) -> int:
+        """Number of keys with a run waiting or running."""
+        return len(self._waiting.keys() | self._running.keys())
+
+    async def _run(self, key: Hashable, call: Callable[[], Awaitable[T]], previous: "asyncio.Task | None") -> T:
+        task = asyncio.current_task()
+        try:
+            if previous is not None:
+                # the previous run's outcome belongs to its own callers
+                await asyncio.wait([previous])
+            if self.debounce_seconds > 0:
+                await asyncio.sleep(self.debounce_seconds)
+        finally:
+            if self._waiting.get(key) is task:
+                del self._waiting[key]
+
+        self._running[key] = task
+        try:
+            return await call()
+        finally:
+            if self._running.get(key) is task:
+                del self._running[key]
+
+
+class KeyedLocks:
+    """
+    One lock per key, created on demand and dropped once nobody holds or waits for it.
+
+    `hold` takes the locks of several keys in sorted order, so callers holding
+    overlapping sets of keys (e.g. two batches of tickets) can never deadlock.
+    """
+
+    def __init__(self):
+        # key → [lock, number of holders and waiters]
+        self._locks: Dict[Hashable, list] = {}
+
+    @asynccontextmanager
+    async def hold(self, *keys: Hashable) -> AsyncIterator[None]:
+        acquired: List[Hashable] = []
+        try:
+            for key in sorted(set(keys)):
+                entry = self._locks.setdefault(key, [asyncio.Lock(), 0])
+                entry[1] += 1
+                try:
+                    await entry[0].acquire()
+                except BaseException:
+                    self._drop(key)
+                    raise
+                acquired.append(key)
+            yield
+        finally:
+            for key in reversed(acquired):
+                self._locks[key][0].release()
+                self._drop(key)
+
+    def _drop(self, key: Hashable) -> None:
+        entry = self._locks[key]
+        entry[1] -= 1
+        if not entry[1]:
+            del self._locks[key]
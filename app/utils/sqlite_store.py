@@ -0,0 +1,33 @@
+import asyncio
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+# Bound parameters per SELECT ... IN (...), well below SQLite's limit
+LOOKUP_CHUNK = 900
+
+
+def connect_sqlite(path: str) -> sqlite3.Connection:
+    """
+    Connection used by every SQLite file of the app (detection cache, ticket state, token vault, SQLite CRM):
+    autocommit (transactions are explicit), usable from another thread than the one opening it.
+    """
+    db = sqlite3.connect(path, timeout=5, isolation_level=None, check_same_thread=False)
+    # WAL lets several worker processes read while one of them writes
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")
+    return db
+
+
+class SqliteThread:
+    """
+    Runs the queries of one connection in a dedicated thread, one at a time and in call order:
+    a query waiting for another process' write lock (up to the `timeout` of `connect_sqlite`)
+    never blocks the event loop, and the connection is never used by two threads at once.
+    """
+
+    def __init__(self, name: str):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=name)
+
+    async def run(self, function: Callable[..., Any], *args: Any) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
@@ -0,0 +1,80 @@
+import re
+from typing import List, Tuple
+
+from app.models.span import Span
+
+# A window may end right after a line break or a sentence end
+_BOUNDARY = re.compile(r"\n|[.!?](?=\s)")
+_WHITESPACE = re.compile(r"\s")
+
+
+def split_into_windows(text: str, max_chars: int, overlap_chars: int) -> List[Tuple[int, int]]:
+    """
+    Splits `text` into overlapping windows of at most `max_chars` characters.
+
+    Windows end at the last sentence or line boundary of their second half
+    (falling back to whitespace, then to a hard cut), and the next window starts
+    at the first boundary within the last `overlap_chars` characters of the previous one.
+
+    Returns `(start, end)` offsets; a single `(0, len(text))` window if no split is needed.
+    """
+    if max_chars <= 0 or len(text) <= max_chars:
+        return [(0, len(text))]
+
+    # the overlap must leave room for progress
+    overlap_chars = max(0, min(overlap_chars, max_chars // 4))
+    windows: List[Tuple[int, int]] = []
+    start = 0
+
+    while True:
+        end = start + max_chars
+        if end >= len(text):
+            windows.append((start, len(text)))
+            return windows
+
+        end = _last_boundary(text, start + max_chars // 2, end)
+        windows.append((start, end))
+
+        # the boundary the window ends on doesn't count, it would leave no overlap
+        start = max(_first_boundary(text, end - overlap_chars, end - 1), start + 1)
+
+
+def stitch_window_entities(windows: List[Tuple[int, List[Span]]]) -> List[Span]:
+    """
+    Shifts entities detected in windows back to offsets in the whole text
+    (`windows` holds `(window start, entities)` pairs) and merges the duplicates
+    and overlapping spans found on both sides of a window seam.
+    An overlapping pair keeps the label of its longer span.
+    """
+    spans = sorted(((offset + e.start, offset + e.end, e.label) for offset, entities in windows for e in entities),
+                   key=lambda span: (span[0], -span[1]))
+
+    stitched: List[Tuple[int, int, str]] = []
+    for start, end, label in spans:
+        if stitched and start < stitched[-1][1]:
+            last_start, last_end, last_label = stitched[-1]
+            if end - start > last_end - last_start:
+                last_label = label
+            stitched[-1] = (last_start, max(end, last_end), last_label)
+        else:
+            stitched.append((start, end, label))
+
+    return [Span(start, end, label) for start, end, label in stitched]
+
+
+def _last_boundary(text: str, lo: int, hi: int) -> int:
+    """Position right after the last boundary in `text[lo:hi]`, or `hi` if there is none."""
+    for pattern in (_BOUNDARY, _WHITESPACE):
+        positions = [match.end() for match in pattern.finditer(text, lo, hi)]
+        if positions:
+            return positions[-1]
+    return hi
+
+
+def _first_boundary(text: str, lo: int, hi: int) -> int:
+    """Position right after the first boundary in `text[lo:hi]`, or `lo` if there is none."""
+    for pattern in (_BOUNDARY, _WHITESPACE):
+        match = pattern.search(text, lo, hi)
+        if match:
+            return match.end()
+    return lo
@@ -0,0 +1,77 @@
+import json
+import time
+from dataclasses import dataclass
+from typing import Dict, List
+
+from app.utils.sqlite_store import SqliteThread, connect_sqlite
+
+
+@dataclass
+class InteractionState:
+    """
+    What the last run knows about an interaction:
+    - `content_hash`: hash of the body it was given,
+    - `redacted_hash`: hash of the body it produced (what the CRM holds after the update),
+    - `entities`: detected spans, as {"start", "end", "label"} dicts.
+    """
+    interaction_id: str
+    content_hash: str
+    redacted_hash: str
+    entities: List[Dict]
+
+
+class TicketStateStore:
+    """
+    Per-ticket record of processed interactions in a SQLite file, so re-running
+    the redaction of a ticket only detects new or edited interactions.
+    Hashes are expected to include the detection version (see `make_cache_key`),
+    so changing the prompt or the model makes every interaction look changed.
+    Queries run in the store's own thread.
+    """
+
+    def __init__(self, path: str):
+        self._thread = SqliteThread("ticket-state")
+        self._db = connect_sqlite(path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS interaction_state ("
+            "source TEXT NOT NULL, ticket_id TEXT NOT NULL, interaction_id TEXT NOT NULL, "
+            "content_hash TEXT NOT NULL, redacted_hash TEXT NOT NULL, entities TEXT NOT NULL, "
+            "updated_at REAL NOT NULL, "
+            "PRIMARY KEY (source, ticket_id, interaction_id))"
+        )
+
+    async def load(self, source: str, ticket_id: str) -> Dict[str, InteractionState]:
+        """States of the ticket's interactions, by interaction id."""
+        rows = await self._thread.run(self._select, source, ticket_id)
+
+        return {row[0]: InteractionState(interaction_id=row[0],
+                                         content_hash=row[1],
+                                         redacted_hash=row[2],
+                                         entities=json.loads(row[3]))
+                for row in rows}
+
+    async def save(self, source: str, ticket_id: str, states: List[InteractionState]) -> None:
+        """Inserts or replaces the given interactions' states in a single transaction."""
+        if not states:
+            return
+
+        rows = [(source, ticket_id, s.interaction_id, s.content_hash, s.redacted_hash, json.dumps(s.entities))
+                for s in states]
+        await self._thread.run(self._insert, rows)
+
+    def _select(self, source: str, ticket_id: str) -> List[tuple]:
+        return self._db.execute(
+            "SELECT interaction_id, content_hash, redacted_hash, entities FROM interaction_state "
+            "WHERE source = ? AND ticket_id = ?", (source, ticket_id)
+        ).fetchall()
+
+    def _insert(self, rows: List[tuple]) -> None:
+        now = time.time()
+        with self._db:
+            self._db.execute("BEGIN")
+            self._db.executemany(
+                "INSERT OR REPLACE INTO interaction_state "
+                "(source, ticket_id, interaction_id, content_hash, redacted_hash, entities, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [row + (now,) for row in rows],
+            )
@@ -0,0 +1,173 @@
+import asyncio
+import re
+import secrets
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Set, Tuple
+
+from app.utils.sqlite_store import LOOKUP_CHUNK, SqliteThread, connect_sqlite
+
+# Tokens as they appear in redacted text: {{LABEL:16 hex characters}}
+TOKEN_PATTERN = re.compile(r"\{\{([^{}:]+):([0-9a-f]{16})\}\}")
+
+
+class TokenVault:
+    """
+    Reversible tokens for the `tokenize` strategy, kept in a SQLite file.
+
+    - Every (label, value) pair gets a random 64-bit token, checked against the vault,
+      so tokens never collide; the same value always gets the same token.
+    - New tokens are buffered and written with `flush()` in a single transaction
+      (once per ticket, before the redacted ticket leaves the app).
+    - The most recently used tokens are kept in memory (`hot_size`), in front of the indexed store.
+    - Queries run in the vault's own thread, never on the event loop: `prepare` returns the tokens
+      of an interaction's values before it is redacted, `tokenizer` makes them a redaction strategy.
+
+    The file holds the original PII values: protect it like the CRM itself.
+    """
+
+    def __init__(self, path: str, hot_size: int = 100_000):
+        self.hot_size = hot_size
+        self._thread = SqliteThread("token-vault")
+        self._db = connect_sqlite(path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS tokens ("
+            "token TEXT PRIMARY KEY, label TEXT NOT NULL, value TEXT NOT NULL, created_at REAL NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        # not unique: two processes may tokenize the same new value at the same time, both tokens stay valid
+        self._db.execute("CREATE INDEX IF NOT EXISTS tokens_by_value ON tokens (label, value)")
+
+        # token → (label, value), least recently used first
+        self._hot: "OrderedDict[str, Tuple[str, str]]" = OrderedDict()
+        self._hot_by_value: Dict[Tuple[str, str], str] = {}
+        # assigned but not written yet, never evicted
+        self._pending: Dict[str, Tuple[str, str]] = {}
+        self._pending_by_value: Dict[Tuple[str, str], str] = {}
+        # one flush at a time: a token is never inserted twice
+        self._flush_lock = asyncio.Lock()
+
+    async def prepare(self, keys: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], str]:
+        """
+        Tokens of these `(label, value)` pairs: from memory, loaded from the vault (in its thread)
+        or newly assigned. Redact with `tokenizer` over the result.
+        """
+        tokens: Dict[Tuple[str, str], str] = {}
+        missing = []
+
+        for key in dict.fromkeys(keys):
+            token = self._hot_by_value.get(key) or self._pending_by_value.get(key)
+            if token is None:
+                missing.append(key)
+            else:
+                tokens[key] = token
+                if token not in self._pending:
+                    self._remember(token, key)
+
+        if missing:
+            found = await self._thread.run(self._select_tokens, missing)
+            new_keys = [key for key in missing if key not in found]
+            new_tokens = await self._thread.run(self._new_tokens, len(new_keys), set(self._pending)) if new_keys else []
+
+            for key, token in found.items():
+                self._remember(token, key)
+                tokens[key] = token
+
+            for key, token in zip(new_keys, new_tokens):
+                # another interaction may have assigned one meanwhile
+                assigned = self._pending_by_value.get(key) or self._hot_by_value.get(key)
+                if assigned is None:
+                    self._assign(token, key)
+                    assigned = token
+                tokens[key] = assigned
+
+        return tokens
+
+    async def flush(self) -> int:
+        """Writes the tokens assigned since the last flush in one transaction; returns their number."""
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+
+            pending = list(self._pending.items())
+            await self._thread.run(self._insert, pending)
+
+            for token, key in pending:
+                del self._pending[token]
+                del self._pending_by_value[key]
+                self._remember(token, key)
+
+            return len(pending)
+
+    async def resolve(self, tokens: Iterable[str]) -> Dict[str, Tuple[str, str]]:
+        """`(label, value)` of every known token; unknown tokens are left out."""
+        resolved: Dict[str, Tuple[str, str]] = {}
+        missing = []
+
+        for token in dict.fromkeys(tokens):
+            key = self._hot.get(token) or self._pending.get(token)
+            if key is None:
+                missing.append(token)
+            else:
+                resolved[token] = key
+
+        if missing:
+            resolved.update(await self._thread.run(self._select_values, missing))
+
+        return resolved
+
+    def _assign(self, token: str, key: Tuple[str, str]) -> None:
+        self._pending[token] = key
+        self._pending_by_value[key] = token
+
+    def _select_tokens(self, keys: List[Tuple[str, str]]) -> Dict[Tuple[str, str], str]:
+        found = {}
+        for key in keys:
+            row = self._db.execute("SELECT token FROM tokens WHERE label = ? AND value = ? LIMIT 1", key).fetchone()
+            if row is not None:
+                found[key] = row[0]
+        return found
+
+    def _select_values(self, tokens: List[str]) -> Dict[str, Tuple[str, str]]:
+        resolved = {}
+        for i in range(0, len(tokens), LOOKUP_CHUNK):
+            chunk = tokens[i:i + LOOKUP_CHUNK]
+            rows = self._db.execute(
+                f"SELECT token, label, value FROM tokens WHERE token IN ({','.join('?' * len(chunk))})", chunk
+            ).fetchall()
+            for token, label, value in rows:
+                resolved[token] = (label, value)
+        return resolved
+
+    def _new_tokens(self, count: int, pending: Set[str]) -> List[str]:
+        """Random tokens, unused in the vault and among the `pending` ones."""
+        tokens: Set[str] = set()
+        while len(tokens) < count:
+            candidates = {secrets.token_hex(8) for _ in range(count - len(tokens))} - tokens - pending
+            tokens |= candidates - set(self._select_values(list(candidates)))
+        return list(tokens)
+
+    def _insert(self, pending: List[Tuple[str, Tuple[str, str]]]) -> None:
+        now = time.time()
+        with self._db:
+            self._db.execute("BEGIN")
+            self._db.executemany("INSERT INTO tokens (token, label, value, created_at) VALUES (?, ?, ?, ?)",
+                                 [(token, label, value, now) for token, (label, value) in pending])
+
+    def _remember(self, token: str, key: Tuple[str, str]) -> None:
+        if self.hot_size <= 0:
+            return
+
+        self._hot[token] = key
+        self._hot.move_to_end(token)
+        self._hot_by_value[key] = token
+
+        while len(self._hot) > self.hot_size:
+            evicted_token, evicted = self._hot.popitem(last=False)
+            if self._hot_by_value.get(evicted) == evicted_token:
+                del self._hot_by_value[evicted]
+
+
+def tokenizer(tokens: Dict[Tuple[str, str], str]) -> Callable[[str, str], str]:
+    """Redaction strategy `{{LABEL:token}}` over the tokens returned by `TokenVault.prepare`."""
+    return lambda span, label: f"{{{{{label}:{tokens[(label, span)]}}}}}"
@@ -0,0 +1,45 @@
+# Compare two benchmark result files
+# -----------------------------------------------------------------------------
+#   python -m benchmarks.compare baseline.json results.json [--threshold 10]
+# Exits with status 1 if any p50 latency got slower by more than the threshold (%).
+# -----------------------------------------------------------------------------
+import argparse
+import json
+import sys
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=10.0, help="allowed p50 slowdown, in percent")
+    args = parser.parse_args()
+
+    baseline = _load(args.baseline)
+    candidate = _load(args.candidate)
+    regressions = 0
+
+    print(f"{'benchmark':<44}{'p50 before':>12}{'p50 after':>12}{'change':>10}")
+    for name, after in candidate.items():
+        before = baseline.get(name)
+        if before is None or not before["p50_ms"]:
+            print(f"{name:<44}{'-':>12}{after['p50_ms']:>12.3f}{'new':>10}")
+            continue
+
+        change = (after["p50_ms"] - before["p50_ms"]) / before["p50_ms"] * 100
+        flag = ""
+        if change > args.threshold:
+            regressions += 1
+            flag = "  ⚠️"
+        print(f"{name:<44}{before['p50_ms']:>12.3f}{after['p50_ms']:>12.3f}{change:>+9.1f}%{flag}")
+
+    sys.exit(1 if regressions else 0)
+
+
+def _load(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return {r["name"]: r for r in json.load(f)["results"]}
+
+
+if __name__ == "__main__":
+    main()
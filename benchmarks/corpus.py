@@ -0,0 +1,144 @@
+# Ticket corpora for benchmarks
+# -----------------------------------------------------------------------------
+# - `load_mock_db`: the tickets of `app/connectors/mock_db.json`
+# - `generate_tickets` / `iter_tickets`: synthetic tickets, deterministic for a
+#   given seed, with a mix of short chat lines and long emails and a
+#   configurable PII density
+# - `CorpusConnector`: serves any of them as a data source of the app
+# -----------------------------------------------------------------------------
+import json
+import os
+import random
+from typing import Dict, Iterator, List
+
+from app.connectors.base_connector import CRMConnector
+from app.models.pydentic_model import Ticket, RedactedTicket, Interaction
+
+MOCK_DB_PATH = os.path.join(os.path.dirname(__file__), "..", "app", "connectors", "mock_db.json")
+
+_FIRST_NAMES = ["Laura", "Mark", "Ivan", "Ana", "Joseph", "Patrick", "Maria", "Chen", "Fatima", "Lucas"]
+_LAST_NAMES = ["Jenkins", "Kolesnikov", "Rivera", "Smith", "Nakamura", "Okafor", "Dubois", "Larsen", "Silva", "Khan"]
+_FILLER = [
+    "Thanks for reaching out, we are looking into it.",
+    "Return processed successfully.",
+    "Reschedule confirmed for Thursday.",
+    "Please reset my password.",
+    "The order was delayed at the warehouse.",
+    "Let us know if you experience further issues.",
+    "Documents forwarded to finance team.",
+    "Resolution expected within 48 hours.",
+]
+
+
+def load_mock_db() -> List[dict]:
+    with open(MOCK_DB_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)["mock_database"]
+
+
+def generate_tickets(count: int,
+                     interactions_per_ticket: int = 10,
+                     pii_density: float = 0.3,
+                     long_email_ratio: float = 0.1,
+                     seed: int = 0) -> List[dict]:
+    """
+    Tickets in the `mock_db.json` shape.
+    `pii_density` is the share of sentences carrying PII,
+    `long_email_ratio` the share of interactions being long emails (~40 sentences).
+    """
+    return list(iter_tickets(count, interactions_per_ticket, pii_density, long_email_ratio, seed))
+
+
+def iter_tickets(count: int,
+                 interactions_per_ticket: int = 10,
+                 pii_density: float = 0.3,
+                 long_email_ratio: float = 0.1,
+                 seed: int = 0) -> Iterator[dict]:
+    """Same tickets as `generate_tickets`, one at a time, for corpora which don't fit in memory."""
+    rng = random.Random(seed)
+
+    for t in range(count):
+        ticket_id = f"bench-{seed}-{t}"
+        interactions = []
+        for i in range(interactions_per_ticket):
+            sentences = 40 if rng.random() < long_email_ratio else rng.randint(1, 2)
+            body = " ".join(_sentence(rng, pii_density) for _ in range(sentences))
+            interactions.append({"id": f"{ticket_id}-{i}", "interaction_body": body})
+        yield {"id": ticket_id, "interactions": interactions}
+
+
+def generate_text(size: int, spans: int, seed: int = 0) -> tuple:
+    """
+    Text of about `size` characters with `spans` PII values spread in it.
+    Returns `(text, [{"label", "text"}, ...])` — the detected spans as the LLM would return them.
+    """
+    rng = random.Random(seed)
+    pii = [_pii_value(rng) for _ in range(spans)]
+    filler_budget = max(size - sum(len(value) for _, value in pii), 0)
+
+    parts = []
+    for label, value in pii:
+        parts.append(_filler(rng, filler_budget // (spans + 1)))
+        parts.append(value)
+    parts.append(_filler(rng, filler_budget // (spans + 1)))
+
+    return " ".join(parts), [{"label": label, "text": value} for label, value in pii]
+
+
+class CorpusConnector(CRMConnector):
+    """In-memory data source over a list of raw tickets; updates are only counted."""
+
+    def __init__(self, raw_tickets: List[dict]):
+        self.tickets: Dict[str, dict] = {t["id"]: t for t in raw_tickets}
+        self.updates = 0
+
+    async def fetch_ticket(self, ticket_id: str) -> Ticket:
+        raw_ticket = self.tickets.get(ticket_id)
+        if raw_ticket is None:
+            raise ValueError(f"Ticket ID {ticket_id} not found in benchmark corpus.")
+
+        return Ticket(ticket_id=raw_ticket["id"],
+                      interactions=[Interaction(interaction_id=i["id"], interaction_body=i["interaction_body"])
+                                    for i in raw_ticket["interactions"]])
+
+    async def update_ticket(self, ticket: RedactedTicket) -> None:
+        self.updates += 1
+
+
+def _sentence(rng: random.Random, pii_density: float) -> str:
+    if rng.random() >= pii_density:
+        return rng.choice(_FILLER)
+
+    label, value = _pii_value(rng)
+    templates = {
+        "name": "Customer {} asked for an update.",
+        "email": "My email is {}.",
+        "phone_number": "Call me back at {}.",
+        "social_security_number": "SSN {} included in uploaded file.",
+        "ip_address": "Login attempt from {} was blocked.",
+    }
+    return templates[label].format(value)
+
+
+def _pii_value(rng: random.Random) -> tuple:
+    label = rng.choice(["name", "email", "phone_number", "social_security_number", "ip_address"])
+    first, last = rng.choice(_FIRST_NAMES), rng.choice(_LAST_NAMES)
+
+    if label == "name":
+        return label, f"{first} {last}"
+    if label == "email":
+        return label, f"{first.lower()}.{last.lower()}{rng.randint(1, 999)}@mail.com"
+    if label == "phone_number":
+        return label, f"+1-555-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}"
+    if label == "social_security_number":
+        return label, f"{rng.randint(100, 899)}-{rng.randint(10, 99)}-{rng.randint(1000, 9999)}"
+    return label, f"10.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}"
+
+
+def _filler(rng: random.Random, size: int) -> str:
+    words = []
+    length = 0
+    while length < size:
+        word = rng.choice(_FILLER)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)
@@ -0,0 +1,111 @@
+# End-to-end benchmarks
+# -----------------------------------------------------------------------------
+# Full fetch → detect → redact → update workflow with the fake LLM runner:
+# - `redact_ticket` called directly,
+# - the FastAPI app through an in-process ASGI client.
+# Both run over `mock_db.json` and over a generated corpus of large tickets.
+# -----------------------------------------------------------------------------
+import asyncio
+import time
+import tracemalloc
+from typing import Awaitable, Callable, Dict, List
+
+import httpx
+
+from app.agents.pii_detector_runner import warm_up
+from app.connectors.connector_registry import register_connector
+from app.models.pydentic_model import DataSourceRequest
+from app.services.redaction_service import redact_ticket
+
+from benchmarks.corpus import CorpusConnector, generate_tickets, load_mock_db
+from benchmarks.fake_runner import install_fake_runners
+from benchmarks.report import summarize
+
+
+async def run_e2e(tickets: int = 200,
+                  interactions_per_ticket: int = 20,
+                  concurrency: int = 16,
+                  latency_ms: float = 200,
+                  failure_rate: float = 0.0,
+                  redaction_strategy: str = "mask",
+                  seed: int = 0) -> List[Dict]:
+    install_fake_runners(latency_ms=latency_ms, failure_rate=failure_rate, seed=seed)
+    # cold start (google.adk import) is measured by `benchmarks.import_profile`, not here
+    warm_up()
+
+    corpora = {
+        "mock_db": load_mock_db(),
+        "generated": generate_tickets(tickets, interactions_per_ticket=interactions_per_ticket, seed=seed),
+    }
+    params = {"concurrency": concurrency, "latency_ms": latency_ms, "failure_rate": failure_rate,
+              "strategy": redaction_strategy}
+
+    results = []
+
+    for corpus_name, raw_tickets in corpora.items():
+        source = f"bench-{corpus_name}"
+        register_connector(source, lambda raw_tickets=raw_tickets: CorpusConnector(raw_tickets))
+        ticket_ids = [t["id"] for t in raw_tickets]
+        corpus_params = dict(params, tickets=len(ticket_ids),
+                             interactions=sum(len(t["interactions"]) for t in raw_tickets))
+
+        async def call_service(ticket_id: str, source=source) -> None:
+            await redact_ticket(DataSourceRequest(source=source, ticket_id=ticket_id),
+                                redaction_strategy=redaction_strategy)
+
+        results.append(await _measure(f"e2e.redact_ticket.{corpus_name}", corpus_params,
+                                      ticket_ids, concurrency, call_service))
+
+        async with _asgi_client() as client:
+            async def call_api(ticket_id: str, source=source) -> None:
+                response = await client.post(f"/ticket-redaction/{source}/{ticket_id}")
+                response.raise_for_status()
+
+            results.append(await _measure(f"e2e.asgi.{corpus_name}", corpus_params,
+                                          ticket_ids, concurrency, call_api))
+
+    return results
+
+
+async def _measure(name: str,
+                   params: Dict,
+                   ticket_ids: List[str],
+                   concurrency: int,
+                   call: Callable[[str], Awaitable[None]]) -> Dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    durations: List[float] = []
+
+    async def timed(ticket_id: str) -> None:
+        async with semaphore:
+            t0 = time.perf_counter()
+            await call(ticket_id)
+            durations.append(time.perf_counter() - t0)
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    await asyncio.gather(*(timed(ticket_id) for ticket_id in ticket_ids))
+    wall = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return summarize(name=name, params=params, durations=durations,
+                     wall_seconds=wall, items=len(ticket_ids), peak_memory_bytes=peak)
+
+
+class _asgi_client:
+    """Runs the app lifespan and yields an httpx client talking to it in-process."""
+
+    async def __aenter__(self) -> httpx.AsyncClient:
+        from app.main import app, API_KEY, API_KEY_NAME
+
+        self._lifespan = app.router.lifespan_context(app)
+        await self._lifespan.__aenter__()
+        self._client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app),
+                                         base_url="http://benchmark",
+                                         headers={API_KEY_NAME: API_KEY or ""},
+                                         timeout=None)
+        return self._client
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self._client.aclose()
+        await self._lifespan.__aexit__(*exc_info)
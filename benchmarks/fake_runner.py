@@ -0,0 +1,102 @@
+# Deterministic stand-in for the ADK Runner
+# -----------------------------------------------------------------------------
+# Answers like the PII detector agents would, without calling any LLM:
+# structured PII comes from the regex pre-detector, full names from a simple
+# "two capitalized words" pattern. Latency and failures are configurable and
+# reproducible (seeded).
+# -----------------------------------------------------------------------------
+import asyncio
+import json
+import random
+import re
+from types import SimpleNamespace
+
+from app.utils.pii_regex_detector import pre_detect_pii
+
+_NAME = re.compile(r"\b[A-Z][a-z]+ [A-Z][a-z]+\b")
+_BATCH_ITEM = re.compile(r"<<<INTERACTION (\d+)>>>\n(.*?)\n<<<END INTERACTION \1>>>", re.S)
+
+
+class FakeLLMError(Exception):
+    """Mimics a google.genai API error, `code` is what the LLM scheduler looks at."""
+
+    def __init__(self, code: int):
+        super().__init__(f"{code} fake LLM error")
+        self.code = code
+
+
+class _FinalEvent:
+    def __init__(self, text: str):
+        self.content = SimpleNamespace(parts=[SimpleNamespace(text=text)])
+
+    def is_final_response(self) -> bool:
+        return True
+
+
+class FakeRunner:
+    """
+    `answer_format`:
+    - "offsets": [{"start", "end", "label"}]           — single detection agent (tool mode)
+    - "spans":   [{"label", "text"}]                   — single detection agent (local locating)
+    - "batch":   [{"interaction", "label", "text"}]    — batch detection agent
+    """
+
+    def __init__(self,
+                 answer_format: str,
+                 latency_ms: float = 200,
+                 jitter: float = 0.2,
+                 failure_rate: float = 0.0,
+                 seed: int = 0):
+        self.answer_format = answer_format
+        self.latency_ms = latency_ms
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.calls = 0
+        self._random = random.Random(seed)
+
+    async def run_async(self, user_id: str, session_id: str, new_message):
+        self.calls += 1
+        latency = self.latency_ms * (1 + self._random.uniform(-self.jitter, self.jitter)) / 1000
+        fails = self._random.random() < self.failure_rate
+
+        await asyncio.sleep(latency)
+        if fails:
+            raise FakeLLMError(503)
+
+        text = new_message.parts[0].text
+
+        if self.answer_format == "batch":
+            answer = [dict(span, interaction=int(match.group(1)))
+                      for match in _BATCH_ITEM.finditer(text)
+                      for span in _find_spans(match.group(2))]
+        elif self.answer_format == "spans":
+            answer = _find_spans(text)
+        else:
+            answer = [{"start": start, "end": end, "label": label} for start, end, label in _find_offsets(text)]
+
+        # LLMs like to wrap their JSON into markdown
+        yield _FinalEvent("```json\n" + json.dumps(answer) + "\n```")
+
+
+def _find_offsets(text: str):
+    offsets = [(e.start, e.end, e.label) for e in pre_detect_pii(text).entities]
+    offsets += [(m.start(), m.end(), "name") for m in _NAME.finditer(text)]
+    return offsets
+
+
+def _find_spans(text: str):
+    return [{"label": label, "text": text[start:end]} for start, end, label in _find_offsets(text)]
+
+
+def install_fake_runners(latency_ms: float = 200,
+                         jitter: float = 0.2,
+                         failure_rate: float = 0.0,
+                         seed: int = 0) -> None:
+    """Replaces the ADK runners of `pii_detector_runner` with fake ones."""
+    from app.agents import pii_detector_runner
+
+    options = dict(latency_ms=latency_ms, jitter=jitter, failure_rate=failure_rate, seed=seed)
+
+    pii_detector_runner.runner = FakeRunner(answer_format="offsets", **options)
+    pii_detector_runner.span_runner = FakeRunner(answer_format="spans", **options)
+    pii_detector_runner.batch_runner = FakeRunner(answer_format="batch", **options)
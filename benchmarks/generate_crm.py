@@ -0,0 +1,48 @@
+# Synthetic CRM corpus for load tests
+# -----------------------------------------------------------------------------
+#   python -m benchmarks.generate_crm crm.sqlite --tickets 1000000
+#   SQLITE_CRM_PATH=crm.sqlite uvicorn app.main:app
+#
+# Writes `iter_tickets` tickets (IDs `bench-<seed>-<n>`) into the SQLite file
+# served by the "sqlite" source, streaming them in batches so the corpus never
+# has to fit in memory. Running it again with the same seed replaces the same
+# tickets; another seed adds new ones.
+# -----------------------------------------------------------------------------
+import argparse
+import json
+import time
+
+from app.connectors.sqlite_crm_connector import SqliteCRMConnector
+
+from benchmarks.corpus import iter_tickets
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate a synthetic ticket corpus for the sqlite source")
+    parser.add_argument("path", help="SQLite file (created if missing)")
+    parser.add_argument("--tickets", type=int, default=100_000)
+    parser.add_argument("--interactions", type=int, default=10, help="interactions per ticket")
+    parser.add_argument("--pii-density", type=float, default=0.3, help="share of sentences carrying PII")
+    parser.add_argument("--long-email-ratio", type=float, default=0.1, help="share of long email interactions")
+    parser.add_argument("--batch-size", type=int, default=10_000, help="tickets per transaction")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    connector = SqliteCRMConnector(args.path)
+    started = time.perf_counter()
+    written = connector.import_tickets(iter_tickets(args.tickets,
+                                                    interactions_per_ticket=args.interactions,
+                                                    pii_density=args.pii_density,
+                                                    long_email_ratio=args.long_email_ratio,
+                                                    seed=args.seed),
+                                       batch_size=args.batch_size)
+    tickets, redacted = connector.count_tickets()
+
+    print(json.dumps({"written": written,
+                      "tickets": tickets,
+                      "redacted": redacted,
+                      "seconds": round(time.perf_counter() - started, 1)}))
+
+
+if __name__ == "__main__":
+    main()
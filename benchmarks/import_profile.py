@@ -0,0 +1,104 @@
+# Cold start profile
+# -----------------------------------------------------------------------------
+#   python -m benchmarks.import_profile --runs 5 --output startup.json
+#   python -m benchmarks.compare startup_baseline.json startup.json
+#
+# Every run starts a fresh interpreter and measures:
+# - startup.import_app:     `import app.main`
+# - startup.first_response: import + lifespan startup + `GET /` and `GET /health`
+# - startup.ready:          until `GET /ready` answers 200 (detection agents built)
+# Then prints the slowest imports of `app.main` (python -X importtime).
+# -----------------------------------------------------------------------------
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+from benchmarks.report import build_report, print_table, summarize, write_report
+
+_ROOT = os.path.join(os.path.dirname(__file__), "..")
+
+_COLD_START = """
+import json, time
+started = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+
+from fastapi.testclient import TestClient
+with TestClient(app.main.app) as client:
+    client.get("/")
+    client.get("/health")
+    first_response = time.perf_counter()
+    while client.get("/ready").status_code != 200:
+        time.sleep(0.05)
+    ready = time.perf_counter()
+
+print(json.dumps({"import_app": imported - started,
+                  "first_response": first_response - started,
+                  "ready": ready - started}))
+"""
+
+
+def run_cold_starts(runs: int) -> List[Dict]:
+    env = dict(os.environ, FAST_API_KEY="benchmark", LOG_LEVEL="WARNING")
+    timings: Dict[str, List[float]] = {"import_app": [], "first_response": [], "ready": []}
+
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", _COLD_START], cwd=_ROOT, env=env,
+                                capture_output=True, text=True, check=True).stdout
+        for name, seconds in json.loads(output.strip().splitlines()[-1]).items():
+            timings[name].append(seconds)
+
+    return [summarize(f"startup.{name}", {"runs": runs}, durations, wall_seconds=sum(durations), items=len(durations))
+            for name, durations in timings.items()]
+
+
+def slowest_imports(top: int) -> List[Tuple[str, float, float]]:
+    """`(module, self ms, cumulative ms)` of the slowest modules imported directly by `app.main`."""
+    stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", "import app.main"], cwd=_ROOT,
+                            env=dict(os.environ, FAST_API_KEY="benchmark"),
+                            capture_output=True, text=True, check=True).stderr
+
+    # a module is reported after its own imports, one indentation level (2 spaces) deeper
+    children: List[Tuple[str, float, float]] = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+
+        if depth == 1:
+            children.append((name.strip(), int(self_us) / 1000, int(cumulative_us) / 1000))
+        elif depth == 0:
+            if name.strip() == "app.main":
+                return sorted(children, key=lambda i: i[2], reverse=True)[:top]
+            children = []
+
+    return []
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cold start profile of the app")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters to start")
+    parser.add_argument("--top", type=int, default=15, help="slowest imports to list")
+    parser.add_argument("--output", help="write machine-readable results to this JSON file")
+    args = parser.parse_args()
+
+    results = run_cold_starts(args.runs)
+    print_table(results)
+
+    print()
+    print(f"{'slowest imports':<60}{'self ms':>12}{'cumul. ms':>12}")
+    for name, self_ms, cumulative_ms in slowest_imports(args.top):
+        print(f"{name:<60}{self_ms:>12.1f}{cumulative_ms:>12.1f}")
+
+    if args.output:
+        write_report(build_report(results, vars(args)), args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+# Micro-benchmarks of the CPU-bound building blocks
+# -----------------------------------------------------------------------------
+# locate_pii_spans, redact_text and strip_markdown on synthetic texts of
+# growing size and span count, and the span/model handling of whole tickets:
+# - locate_pii_spans[baseline]: the former locator (one `re.finditer` over the
+#   whole text per span, a `PIIEntity` per match), for comparison
+# - ticket_models[pydantic]: every span validated as a `PIIEntity`, models
+#   validated on construction and again as a FastAPI `response_model`
+# - ticket_models[spans]:    what the app does — answers validated once into
+#   `Span` tuples, API models built once, `model_dump_json`
+# -----------------------------------------------------------------------------
+import json
+import re
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+from app.utils.pii_spans_locator import locate_pii_spans, find_pii_spans
+from app.utils.pii_redactor import redact_text
+from app.utils.markdown_stripper import strip_markdown
+from app.models.pydentic_model import PIIEntity, RedactedInteraction, RedactedTicket
+from app.models.span import parse_llm_entities, to_pii_entities
+
+from benchmarks.corpus import generate_text
+from benchmarks.report import summarize
+
+# (text size in characters, number of spans)
+CASES = [(1_000, 5), (10_000, 50), (100_000, 500)]
+
+# (interactions per ticket, spans per interaction)
+TICKET_CASES = [(10, 10), (100, 50)]
+
+
+def run_micro(repeat: int = 50, strategies: List[str] = ("mask", "tokenize")) -> List[Dict]:
+    results = []
+
+    for size, span_count in CASES:
+        text, spans = generate_text(size=size, spans=span_count)
+        entities = find_pii_spans(text, spans)
+        llm_payload = "```json\n" + json.dumps([e._asdict() for e in entities]) + "\n```"
+        params = {"text_size": size, "spans": span_count}
+
+        results.append(_measure("locate_pii_spans[baseline]", params, repeat, lambda: _locate_pii_spans_baseline(text, spans)))
+        results.append(_measure("locate_pii_spans", params, repeat, lambda: locate_pii_spans(text, spans)))
+        for strategy in strategies:
+            results.append(_measure(f"redact_text[{strategy}]", params, repeat,
+                                    lambda: redact_text(text, entities, strategy)))
+        results.append(_measure("strip_markdown", params, repeat, lambda: strip_markdown(llm_payload)))
+
+    for interaction_count, span_count in TICKET_CASES:
+        answers = []
+        for i in range(interaction_count):
+            text, spans = generate_text(size=40 * span_count, spans=span_count, seed=i)
+            answers.append((f"int-{i}", text, locate_pii_spans(text, spans)))
+        params = {"text_size": sum(len(text) for _, text, _ in answers),
+                  "interactions": interaction_count,
+                  "spans": interaction_count * span_count}
+
+        results.append(_measure("ticket_models[pydantic]", params, repeat, lambda: _ticket_json_pydantic(answers)))
+        results.append(_measure("ticket_models[spans]", params, repeat, lambda: _ticket_json_spans(answers)))
+
+    return results
+
+
+def _locate_pii_spans_baseline(text: str, spans: List[Dict[str, str]]) -> List[PIIEntity]:
+    entities = []
+    for span in spans:
+        if not span["text"]:
+            continue
+        for match in re.finditer(re.escape(span["text"]), text):
+            entities.append(PIIEntity(start=match.start(), end=match.end(), label=span["label"]))
+    return entities
+
+
+def _ticket_json_pydantic(answers: List[Tuple[str, str, List[Dict]]]) -> str:
+    interactions = []
+    for interaction_id, text, payload in answers:
+        entities = [PIIEntity(**e) for e in payload]
+        interactions.append(RedactedInteraction(interaction_id=interaction_id,
+                                                interaction_body=redact_text(text, entities),
+                                                pii_entities=entities))
+    ticket = RedactedTicket(ticket_id="bench", interactions=interactions)
+
+    # FastAPI with `response_model`: dump, validate against the model, encode
+    validated = RedactedTicket.model_validate(ticket.model_dump())
+    return json.dumps(validated.model_dump(mode="json"))
+
+
+def _ticket_json_spans(answers: List[Tuple[str, str, List[Dict]]]) -> str:
+    interactions = []
+    for interaction_id, text, payload in answers:
+        spans = parse_llm_entities(payload)
+        interactions.append(RedactedInteraction.model_construct(interaction_id=interaction_id,
+                                                                interaction_body=redact_text(text, spans),
+                                                                pii_entities=to_pii_entities(spans)))
+    ticket = RedactedTicket.model_construct(ticket_id="bench", interactions=interactions)
+
+    return ticket.model_dump_json()
+
+
+def _measure(name: str, params: Dict, repeat: int, function: Callable) -> Dict:
+    # warm-up, then timing without tracemalloc (it slows allocations down)
+    function()
+
+    durations = []
+    started = time.perf_counter()
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - t0)
+    wall = time.perf_counter() - started
+
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return summarize(name=f"micro.{name}.{params['text_size']}",
+                     params=params,
+                     durations=durations,
+                     wall_seconds=wall,
+                     items=repeat,
+                     peak_memory_bytes=peak)
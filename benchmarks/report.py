@@ -0,0 +1,78 @@
+import json
+import platform
+import subprocess
+import time
+from typing import Dict, List, Optional
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(name: str,
+              params: Dict,
+              durations: List[float],
+              wall_seconds: float,
+              items: int,
+              peak_memory_bytes: Optional[int] = None) -> Dict:
+    """
+    One benchmark result: `durations` are per-operation latencies in seconds,
+    throughput is `items` per second of `wall_seconds`.
+    """
+    ordered = sorted(durations)
+
+    return {
+        "name": name,
+        "params": params,
+        "operations": len(durations),
+        "throughput_per_sec": round(items / wall_seconds, 2) if wall_seconds else None,
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 3),
+        "peak_memory_kb": round(peak_memory_bytes / 1024, 1) if peak_memory_bytes is not None else None,
+    }
+
+
+def build_report(results: List[Dict], options: Dict) -> Dict:
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "options": options,
+        },
+        "results": results,
+    }
+
+
+def write_report(report: Dict, path: Optional[str]) -> None:
+    text = json.dumps(report, indent=2)
+    if path:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+def print_table(results: List[Dict]) -> None:
+    print(f"{'benchmark':<44}{'ops/s':>12}{'p50 ms':>11}{'p95 ms':>11}{'p99 ms':>11}{'peak KB':>12}")
+    for r in results:
+        print(f"{r['name']:<44}{_fmt(r['throughput_per_sec']):>12}{_fmt(r['p50_ms']):>11}"
+              f"{_fmt(r['p95_ms']):>11}{_fmt(r['p99_ms']):>11}{_fmt(r['peak_memory_kb']):>12}")
+
+
+def _fmt(value) -> str:
+    return "-" if value is None else f"{value:,.2f}"
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
@@ -0,0 +1,56 @@
+# Benchmark runner
+# -----------------------------------------------------------------------------
+#   python -m benchmarks.run --suite all --output results.json
+#   python -m benchmarks.compare baseline.json results.json
+# -----------------------------------------------------------------------------
+import argparse
+import asyncio
+import os
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="PII redaction benchmarks")
+    parser.add_argument("--suite", choices=["micro", "e2e", "all"], default="all")
+    parser.add_argument("--output", help="write machine-readable results to this JSON file")
+    parser.add_argument("--repeat", type=int, default=50, help="micro: iterations per case")
+    parser.add_argument("--tickets", type=int, default=200, help="e2e: generated tickets")
+    parser.add_argument("--interactions", type=int, default=20, help="e2e: interactions per generated ticket")
+    parser.add_argument("--concurrency", type=int, default=16, help="e2e: tickets processed at the same time")
+    parser.add_argument("--latency-ms", type=float, default=200, help="e2e: fake LLM latency")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="e2e: share of fake LLM calls failing with 503")
+    parser.add_argument("--strategy", default="mask", help="redaction strategy")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cache", action="store_true", help="keep the detection cache enabled")
+    args = parser.parse_args()
+
+    # Settings are read at import time, so they must be set before importing the app
+    os.environ["FAST_API_KEY"] = "benchmark"
+    if not args.cache:
+        os.environ["DETECTION_CACHE_ENABLED"] = "false"
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+    from benchmarks.report import build_report, write_report, print_table
+    from benchmarks.micro import run_micro
+    from benchmarks.e2e import run_e2e
+
+    results = []
+
+    if args.suite in ("micro", "all"):
+        results += run_micro(repeat=args.repeat, strategies=["mask", "tokenize", "hash"])
+
+    if args.suite in ("e2e", "all"):
+        results += asyncio.run(run_e2e(tickets=args.tickets,
+                                       interactions_per_ticket=args.interactions,
+                                       concurrency=args.concurrency,
+                                       latency_ms=args.latency_ms,
+                                       failure_rate=args.failure_rate,
+                                       redaction_strategy=args.strategy,
+                                       seed=args.seed))
+
+    print_table(results)
+    if args.output:
+        write_report(build_report(results, vars(args)), args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+import os
+
+# Settings are read at import time, so they must be set before importing the app
+os.environ.setdefault("FAST_API_KEY", "test")
+os.environ.setdefault("DETECTION_CACHE_ENABLED", "false")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
@@ -0,0 +1,29 @@
+import asyncio
+import json
+
+from app.cli import bulk_redact
+from app.services import redaction_service
+
+
+def _line(ticket_id: str, *bodies: str) -> bytes:
+    return json.dumps({"id": ticket_id,
+                       "interactions": [{"id": f"{ticket_id}-{i}", "interaction_body": body}
+                                        for i, body in enumerate(bodies)]}).encode("utf-8")
+
+
+def test_ticket_with_a_failed_detection_goes_to_failed_lines(monkeypatch):
+    async def detect_pii(text):
+        if "unreachable" in text:
+            raise RuntimeError("503 LLM unavailable")
+        return []
+
+    monkeypatch.setattr(redaction_service, "detect_pii", detect_pii)
+
+    ok = _line("1", "Thanks for your patience.")
+    partial = _line("2", "Thanks for your patience.", "LLM unreachable for this one.")
+    empty = _line("3", "LLM unreachable here too.")
+
+    results = asyncio.run(bulk_redact._redact_lines_async([ok, partial, empty], "mask", concurrency=4))
+
+    assert json.loads(results[0])["ticket_id"] == "1"
+    assert results[1:] == [None, None]
@@ -0,0 +1,51 @@
+import pytest
+
+from app.models.span import Span
+from app.utils.pii_regex_detector import pre_detect_pii
+
+
+@pytest.mark.parametrize("text", [
+    "Reschedule confirmed for Thursday.",
+    "Good morning. Please reset my password.",
+    "Thanks, I’m looking into it.",
+])
+def test_plain_sentence_skips_llm(text):
+    result = pre_detect_pii(text)
+
+    assert not result.needs_llm
+    assert result.entities == []
+
+
+@pytest.mark.parametrize("text, label", [
+    ("My email is laura.jenkins1984@mail.com", "email"),
+    ("Call me back at +1-555-843-2233.", "phone_number"),
+])
+def test_structured_only_sentence_skips_llm(text, label):
+    result = pre_detect_pii(text)
+
+    assert not result.needs_llm
+    assert [e.label for e in result.entities] == [label]
+
+
+@pytest.mark.parametrize("text", [
+    "Hi, I'm Laura Jenkins.",
+    "We received a return request from Mark.",
+    "Mi nombre es Ana Pérez",
+    "JOHN SMITH called",
+    "José llamó ayer",
+    "Delivery failed at 28th Street.",
+    "Patient DOB: 1976-08-19",
+    "User mentioned ID: 38272931 in the chat.",
+])
+def test_possible_name_address_date_or_id_needs_llm(text):
+    assert pre_detect_pii(text).needs_llm
+
+
+def test_sentence_whose_only_name_is_known_skips_llm():
+    text = "Laura Jenkins confirmed the order."
+
+    result = pre_detect_pii(text, known=[Span(0, 13, "name")])
+
+    assert not result.needs_llm
+    assert result.entities == [Span(0, 13, "name")]
+    assert pre_detect_pii(text).needs_llm
@@ -0,0 +1,26 @@
+import asyncio
+
+from app.models.pydentic_model import DataSourceRequest
+from app.services import redaction_service
+
+
+def test_stalled_stream_does_not_hold_the_ticket(monkeypatch):
+    async def detect_pii(text):
+        return []
+
+    monkeypatch.setattr(redaction_service, "detect_pii", detect_pii)
+    event = DataSourceRequest(source="test", ticket_id="2001")
+
+    async def scenario():
+        stream = redaction_service.redact_ticket_stream(event, "mask")
+        # a client reading one record, then nothing
+        await stream.__anext__()
+
+        redacted_ticket = await asyncio.wait_for(redaction_service.redact_ticket(event, "mask"), timeout=5)
+        await stream.aclose()
+        return redacted_ticket
+
+    redacted_ticket = asyncio.run(scenario())
+
+    assert redacted_ticket.ticket_id == "2001"
+    assert len(redacted_ticket.interactions) == 3
@@ -0,0 +1,30 @@
+import asyncio
+
+import pytest
+
+from app.utils.token_vault import TokenVault, tokenizer
+
+
+def test_prepared_tokens_are_stable_without_hot_cache(tmp_path):
+    path = str(tmp_path / "vault.sqlite")
+    key = ("name", "Laura Jenkins")
+
+    async def scenario():
+        vault = TokenVault(path, hot_size=0)
+        tokens = await vault.prepare([key, key])
+        await vault.flush()
+
+        # another process reads the same file
+        again = await TokenVault(path, hot_size=0).prepare([key])
+        return tokens, again, await vault.resolve(tokens.values())
+
+    tokens, again, resolved = asyncio.run(scenario())
+
+    assert tokens == again
+    assert resolved == {tokens[key]: key}
+    assert tokenizer(tokens)("Laura Jenkins", "name") == f"{{{{name:{tokens[key]}}}}}"
+
+
+def test_unprepared_value_is_never_looked_up_on_the_event_loop():
+    with pytest.raises(KeyError):
+        tokenizer({})("Laura Jenkins", "name")